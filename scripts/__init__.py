@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""Development scripts of Tactile Maps.
+
+Scripts are run from the root of the repository, as modules, with the
+Python of a QGIS installation, e.g.:
+
+    python3 -m scripts.braille_benchmark
+
+Modules:
+- scripts.braille_benchmark: Throughput of the Braille translation on long
+labels, against the former translation.
+- scripts.headless: Start and stop QGIS without its GUI.
+"""
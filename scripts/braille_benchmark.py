@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Measure the throughput of the Braille translation on long labels.
+
+The table of glyphs of braille.layout and braille.translate is timed
+against the former translation, which converted every character and
+created a point for every dot. The dot coordinates are timed apart from
+the MultiPoint geometries, and both translations must give the same dots.
+Run from the root of the repository, as in scripts/__init__.py:
+
+    python3 -m scripts.braille_benchmark [--lines N] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+
+from qgis.core import QgsGeometry, QgsMultiPoint
+
+from scripts.headless import qgis_application
+from tactilemaps.utils import braille
+
+LINE = 'Río de la Plata, Buenos Aires 1810: ¿Qué? ¡Sí! "Ñandú".'
+
+
+def former_coords(text):
+    """Lay out the dots of a text as before the table of glyphs.
+
+    Return a tuple of a list of (x, y) tuples and a (possibly empty) list
+    of not implemented characters.
+    """
+    coords = []
+    errors = []
+    for row_idx, line in enumerate(text.splitlines()):
+        y_off = - row_idx * braille.DIM["d"]
+        cell_idx = 0
+        for char in line:
+            char_cells = braille.convert_char(char)
+            if not char_cells:
+                errors.append(char)
+                continue
+            for _cell in char_cells:
+                x_off = cell_idx * braille.DIM["c"]
+                for i, row in enumerate(_cell):
+                    for j, val in enumerate(row):
+                        if val:
+                            coords.append((
+                                x_off + j * braille.DIM["a"],
+                                y_off + (2 - i) * braille.DIM["b"]
+                            ))
+                cell_idx += 1
+    return coords, errors
+
+
+def former_translate(text):
+    """Translate a text to braille points as before the table of glyphs.
+
+    Return a tuple of a MultiPoint geometry (or None) and a
+    (possibly empty) list of not implemented characters.
+    """
+    all_points = []
+    errors = []
+    for row_idx, line in enumerate(text.splitlines()):
+        y_off = - row_idx * braille.DIM["d"]
+        cell_idx = 0
+        for char in line:
+            char_cells = braille.convert_char(char)
+            if not char_cells:
+                errors.append(char)
+                continue
+            for _cell in char_cells:
+                x_off = cell_idx * braille.DIM["c"]
+                all_points.extend(braille.create_points(_cell, x_off, y_off))
+                cell_idx += 1
+
+    multipoints = None
+    if all_points:
+        multipoints = QgsMultiPoint(all_points)
+    return multipoints, errors
+
+
+def best_time(function, text, repeat):
+    """Return the best time of 'repeat' runs of a translation, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function(text)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def compare(name, former, current, text, repeat):
+    """Print the throughput of both functions on a text and the speedup."""
+    chars = len(text) - text.count('\n')
+    braille.glyph.cache_clear()
+    former_time = best_time(former, text, repeat)
+    current_time = best_time(current, text, repeat)
+    print(
+        f'{name}: former {former_time:.4f} s '
+        f'({chars / former_time:,.0f} characters/s), glyphs '
+        f'{current_time:.4f} s ({chars / current_time:,.0f} characters/s), '
+        f'speedup {former_time / current_time:.1f}x.'
+    )
+
+
+def main():
+    """Time both translations and report their throughput."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--lines',
+        type=int,
+        default=1000,
+        help='count of lines of the label'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='count of runs of each translation'
+    )
+    args = parser.parse_args()
+    text = '\n'.join([LINE] * args.lines)
+
+    coords, _errors = former_coords(text)
+    if coords != [tuple(xy) for xy in braille.layout(text)[0].tolist()]:
+        print('FAIL: the layouts give different dots.')
+        return 1
+    print(
+        f'{args.lines} lines of {len(LINE)} characters, '
+        f'best of {args.repeat}:'
+    )
+    compare('Coordinates', former_coords, braille.layout, text, args.repeat)
+
+    with qgis_application():
+        former, _errors = former_translate(text)
+        current, _errors = braille.translate(text)
+        if not QgsGeometry(former).isGeosEqual(QgsGeometry(current)):
+            print('FAIL: the translations give different points.')
+            return 1
+        compare(
+            'MultiPoint',
+            former_translate,
+            braille.translate,
+            text,
+            args.repeat
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
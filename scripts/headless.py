@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Start and stop QGIS without its GUI.
+
+Only qgis.core is initialized, so the scripts and tests using it run with
+the Python of a QGIS installation, without a display.
+"""
+
+from contextlib import contextmanager
+
+from qgis.core import QgsApplication
+
+
+@contextmanager
+def qgis_application():
+    """Initialize QGIS without its GUI while the context is active."""
+    QgsApplication.setPrefixPath('', True)
+    app = QgsApplication([], False)
+    app.initQgis()
+    try:
+        yield app
+    finally:
+        app.exitQgis()
@@ -14,8 +14,6 @@
 ************************************************************************
 """
 
-from math import ceil
-
 from qgis.core import (
     QgsGeometry,
     QgsFeature,
@@ -30,8 +28,6 @@ from qgis.core import (
     QgsProcessingParameterExtent,
     QgsProcessingParameterFeatureSink,
     QgsProcessingParameterNumber,
-    QgsRectangle,
-    QgsUnitTypes,
     QgsWkbTypes
 )
 from qgis.PyQt.QtCore import (
@@ -40,6 +36,8 @@ from qgis.PyQt.QtCore import (
     QSettings
 )
 
+from tactilemaps.utils import scale
+
 
 class ComputeScale(QgsProcessingAlgorithm):
     """Compute Scale algorithm class."""
@@ -260,26 +258,16 @@ class ComputeScale(QgsProcessingAlgorithm):
             )
         if feedback.isCanceled():
             return {}
-        # Compute multiplier from map units (mm^-1) to extent crs units
-        crs_units = crs.mapUnits()
-        # Get the unit factor from meters to CRS units and adjust to tenths
-        #  of milimeter.
-        units_factor = QgsUnitTypes.fromUnitToUnitFactor(
-            QgsUnitTypes.DistanceMeters,
-            crs_units
-        ) / 10000.0
-        # Compute map width and height in the units of the extent crs
-        map_width = width * units_factor
-        map_height = height * units_factor
-        # Expand input extent to margin
-        extent.scale(1 + margin/100)
-        # Scale denominator without round
-        scale = max(
-            extent.width() / map_width,
-            extent.height() / map_height
+        # Compute the scale denominator, rounded to a multiple, and the
+        #  rectangle covered by the map at that scale.
+        rounded_scale, rectangle = scale.compute_scale(
+            extent,
+            crs,
+            width,
+            height,
+            margin,
+            multiple
         )
-        # Round (to a multiple) the scale denominator
-        rounded_scale = multiple * ceil(scale/multiple)
         QSettings().setValue(
             'tactilemaps/scalevectorlayer/scale',
             rounded_scale
@@ -287,13 +275,6 @@ class ComputeScale(QgsProcessingAlgorithm):
         # Create feature, attribute and geometry
         feat = QgsFeature(fields)
         feat.setAttribute('scale', rounded_scale)
-        rect_width = map_width * rounded_scale
-        rect_height = map_height * rounded_scale
-        rectangle = QgsRectangle.fromCenterAndSize(
-            extent.center(),
-            rect_width,
-            rect_height
-        )
         geom = QgsGeometry.fromRect(rectangle)
         feat.setGeometry(geom)
         sink.addFeature(feat, QgsFeatureSink.FastInsert)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Export a tactile map as a solid mesh.
+
+************************************************************************
+    Name                : exportmesh_algorithm.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import os
+import time
+
+from qgis.core import (
+    Qgis,
+    QgsProcessingParameterFileDestination,
+    QgsProcessingParameterNumber
+)
+
+from tactilemaps.processing.algorithms.rasterize_algorithm import RasterizeMap
+from tactilemaps.utils import mesh
+
+
+class ExportMesh(RasterizeMap):
+    """Export a tactile map as a solid mesh."""
+
+    BASE = "BASE"
+    FLAT_TOLERANCE = "FLAT_TOLERANCE"
+    OUTPUT_MESH = "OUTPUT_MESH"
+
+    def createInstance(self):
+        """Return a new instance of the algorithm."""
+        return ExportMesh()
+
+    def name(self):
+        """Return the algorithm name."""
+        return 'exportmesh'
+
+    def displayName(self):
+        """Return the algorithm display name."""
+        return self.tr('Export tactile mesh')
+
+    def shortHelpString(self):
+        """Return the display help of the algortihm."""
+        return self.tr(
+            """
+            Export a map from polygon layers as a solid mesh, ready to \
+                be 3D printed.
+            The map is burned and smoothed as in Rasterize map, and the \
+                smoothed heights are meshed straight away, without \
+                writing a raster in between.
+            All units are in tenths of milimeter, and the mesh is written \
+                in milimeters.
+            The top surface has a vertex at the center of each pixel, \
+                raised over a flat base of the given thickness, and it is \
+                closed with walls and a flat bottom at zero height.
+            The output is a binary STL or a 3MF file, by its extension. \
+                If the export is canceled, the partial file is removed.
+            The mesh is always built and written by strips of rows, and \
+                the map is smoothed by strips of the same size when the \
+                block size is 0, so the memory used is bounded by the \
+                size of the strips instead of the size of the map.
+            Flat regions, as the background of the map, are merged with a \
+                quadtree into large squares before the triangulation: \
+                squares whose heights differ less than the flat region \
+                tolerance are covered by a few triangles over their border. \
+                A negative tolerance keeps two triangles per pixel.
+            """
+        )
+
+    def shortDescription(self):
+        """Return the display description of the algorithm."""
+        return self.tr('Export a map from polygon layers as a solid mesh.')
+
+    def initAlgorithm(self, config=None):
+        """Define the inputs and outputs of the algorithm."""
+        self.init_map_parameters()
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.BASE,
+                "Base thickness",
+                type=Qgis.ProcessingNumberParameterType.Double,
+                minValue=0.1,
+                defaultValue=self.rw_settings('r', 'base', 20)
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.FLAT_TOLERANCE,
+                "Flat region tolerance (negative to keep every pixel)",
+                type=Qgis.ProcessingNumberParameterType.Double,
+                minValue=-1,
+                defaultValue=self.rw_settings('r', 'flat_tolerance', 0.5)
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFileDestination(
+                self.OUTPUT_MESH,
+                "Mesh",
+                fileFilter="STL files (*.stl);;3MF files (*.3mf)"
+            )
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """Export a map from polygon layers as a solid mesh."""
+        base = self.parameterAsDouble(
+            parameters,
+            self.BASE,
+            context
+        )
+        self.rw_settings('w', 'base', base)
+
+        flat_tolerance = self.parameterAsDouble(
+            parameters,
+            self.FLAT_TOLERANCE,
+            context
+        )
+        self.rw_settings('w', 'flat_tolerance', flat_tolerance)
+
+        output_file = self.parameterAsFileOutput(
+            parameters,
+            self.OUTPUT_MESH,
+            context
+        )
+
+        # The memory is bounded by strips of rows, even if the block size
+        # parameter asks to smooth the whole map at once.
+        smoothed = self.smooth_map(
+            parameters,
+            context,
+            feedback,
+            mesh.STRIP_ROWS
+        )
+        if smoothed is None:
+            return {}
+        rasterized_dataset, blocks = smoothed
+        geotransform = rasterized_dataset.GetGeoTransform()
+        y_size = rasterized_dataset.RasterYSize
+
+        start_time = time.perf_counter()
+        triangles = 0
+        complete = False
+        writer = mesh.writer_for(output_file)
+        try:
+            strips = mesh.iter_mesh(
+                mesh.iter_strips(blocks, mesh.STRIP_ROWS),
+                y_size,
+                geotransform,
+                base,
+                flat_tolerance if flat_tolerance >= 0 else None
+            )
+            for rows, chunk in strips:
+                if feedback.isCanceled():
+                    break
+                writer.write(chunk)
+                triangles += len(chunk)
+                feedback.setProgress(int(100 * rows / y_size))
+            complete = not feedback.isCanceled()
+        finally:
+            writer.close()
+            # A canceled or failed export does not leave a truncated mesh.
+            if not complete and os.path.exists(output_file):
+                os.remove(output_file)
+        blocks = None
+        rasterized_dataset = None
+
+        if feedback.isCanceled():
+            return {}
+        feedback.pushInfo(
+            f"Mesh of {triangles} triangles written in "
+            f"{time.perf_counter() - start_time:.2f} s."
+        )
+
+        return {self.OUTPUT_MESH: output_file}
@@ -15,14 +15,20 @@
 """
 
 from qgis.core import (
+    QgsFeature,
     QgsFeatureSink,
     QgsField,
+    QgsGeometry,
     QgsProcessing,
     QgsProcessingAlgorithm,
     QgsProcessingException,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterDefinition,
+    QgsProcessingParameterEnum,
     QgsProcessingParameterFeatureSink,
     QgsProcessingParameterNumber,
-    QgsProcessingParameterVectorLayer
+    QgsProcessingParameterVectorLayer,
+    QgsWkbTypes
 )
 from qgis.PyQt.QtCore import (
     QCoreApplication,
@@ -32,7 +38,7 @@ from qgis.PyQt.QtCore import (
 
 import processing
 
-from tactilemaps.utils import braille
+from tactilemaps.utils import braille, cache, edges
 
 
 class ExtractEdges(QgsProcessingAlgorithm):
@@ -40,6 +46,13 @@ class ExtractEdges(QgsProcessingAlgorithm):
 
     INPUT = 'INPUT'
     WIDTH = 'WIDTH'
+    ENGINE = 'ENGINE'
+    THREADS = 'THREADS'
+    TILE_SIZE = 'TILE_SIZE'
+    SPLIT_TILES = 'SPLIT_TILES'
+    SHARED_BOUNDARIES = 'SHARED_BOUNDARIES'
+    TARGET_RESOLUTION = 'TARGET_RESOLUTION'
+    USE_CACHE = 'USE_CACHE'
     OUTPUT = 'OUTPUT'
 
     def tr(self, string):
@@ -90,6 +103,32 @@ class ExtractEdges(QgsProcessingAlgorithm):
                 polygons with the edges buffered to fill a width.
             The width of the output polygon must be expressed in tenths of \
                 milimiter.
+            The fused engine reads the input once and buffers every \
+                geometry in memory. The chain engine runs a processing \
+                algorithm per step, writing a temporary layer for each one.
+            The buffers and differences of the fused engine can be computed \
+                by several threads; the output does not depend on the \
+                number of threads.
+            Edges are dissolved by tiles of a grid, merged bottom-up. \
+                They can be kept split by tile, which is faster and \
+                rasterizes the same.
+            For layers of adjacent polygons, as administrative or cadastral \
+                units, the fused engine can buffer the shared boundaries \
+                once: the unique segments of all the boundaries are merged \
+                into lines, and each line is buffered to both sides.
+            With a target resolution, as the pixel size of the rasterized \
+                map, the simplification tolerance is half of it, and the \
+                buffers get the fewest segments that keep their arcs \
+                within that tolerance, so the vertices scale with the \
+                output instead of the input. Tolerances above a tenth of \
+                milimeter preserve the topology of the fused engine.
+            With the result cache, off by default, the edges are kept on \
+                disk, keyed by the content of the input layer and the \
+                parameters, and returned at once when nothing changed. \
+                The least recently used results are removed above a \
+                total size.
+            Both engines only repair the invalid geometries of each step, \
+                and report how many geometries were checked and repaired.
             """
         )
 
@@ -117,6 +156,97 @@ class ExtractEdges(QgsProcessingAlgorithm):
         )
         self.addParameter(width_param)
 
+        engine_param = QgsProcessingParameterEnum(
+            self.ENGINE,
+            self.tr('Processing engine'),
+            options=[
+                self.tr('Fused (single pass in memory)'),
+                self.tr('Chain of processing algorithms')
+            ],
+            defaultValue=int(self.rw_settings('r', 'engine', 0))
+        )
+        engine_param.setFlags(
+            engine_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(engine_param)
+
+        threads_param = QgsProcessingParameterNumber(
+            self.THREADS,
+            self.tr('Number of threads of the fused engine'),
+            QgsProcessingParameterNumber.Integer,
+            minValue=1,
+            defaultValue=self.rw_settings('r', 'threads', 1)
+        )
+        threads_param.setFlags(
+            threads_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(threads_param)
+
+        tile_size_param = QgsProcessingParameterNumber(
+            self.TILE_SIZE,
+            self.tr('Tile size to dissolve edges (0 for automatic)'),
+            QgsProcessingParameterNumber.Double,
+            minValue=0,
+            defaultValue=self.rw_settings('r', 'tile_size', 0)
+        )
+        tile_size_param.setFlags(
+            tile_size_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(tile_size_param)
+
+        split_param = QgsProcessingParameterBoolean(
+            self.SPLIT_TILES,
+            self.tr('Keep the edges split by tile'),
+            defaultValue=False
+        )
+        split_param.setFlags(
+            split_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(split_param)
+
+        shared_param = QgsProcessingParameterBoolean(
+            self.SHARED_BOUNDARIES,
+            self.tr('Buffer shared boundaries once'),
+            defaultValue=self.rw_settings('r', 'shared_boundaries', False)
+            in (True, 'true')
+        )
+        shared_param.setFlags(
+            shared_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(shared_param)
+
+        resolution_param = QgsProcessingParameterNumber(
+            self.TARGET_RESOLUTION,
+            self.tr(
+                'Target resolution (0 for fixed simplification and segments)'
+            ),
+            QgsProcessingParameterNumber.Double,
+            minValue=0,
+            defaultValue=self.rw_settings('r', 'target_resolution', 0)
+        )
+        resolution_param.setFlags(
+            resolution_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(resolution_param)
+
+        cache_param = QgsProcessingParameterBoolean(
+            self.USE_CACHE,
+            self.tr('Use the result cache'),
+            defaultValue=self.rw_settings('r', 'use_cache', False)
+            in (True, 'true')
+        )
+        cache_param.setFlags(
+            cache_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(cache_param)
+
         # OUTPUTS
         edges_output = QgsProcessingParameterFeatureSink(
             self.OUTPUT,
@@ -133,15 +263,227 @@ class ExtractEdges(QgsProcessingAlgorithm):
             fill a width expressed in tenths of milimeter.
         """
         # Get parameters and write settings
+        input_layer = self.parameterAsVectorLayer(
+            parameters,
+            self.INPUT,
+            context
+        )
         edge_width = self.parameterAsInt(
             parameters,
             self.WIDTH,
             context
         )
         self.rw_settings('w', 'edge_width', edge_width)
+        engine = self.parameterAsEnum(
+            parameters,
+            self.ENGINE,
+            context
+        )
+        self.rw_settings('w', 'engine', engine)
+        threads = self.parameterAsInt(
+            parameters,
+            self.THREADS,
+            context
+        )
+        self.rw_settings('w', 'threads', threads)
+        tile_size = self.parameterAsDouble(
+            parameters,
+            self.TILE_SIZE,
+            context
+        )
+        self.rw_settings('w', 'tile_size', tile_size)
+        split_tiles = self.parameterAsBool(
+            parameters,
+            self.SPLIT_TILES,
+            context
+        )
+        shared_boundaries = self.parameterAsBool(
+            parameters,
+            self.SHARED_BOUNDARIES,
+            context
+        )
+        self.rw_settings('w', 'shared_boundaries', shared_boundaries)
+        target_resolution = self.parameterAsDouble(
+            parameters,
+            self.TARGET_RESOLUTION,
+            context
+        )
+        self.rw_settings('w', 'target_resolution', target_resolution)
+        use_cache = self.parameterAsBool(
+            parameters,
+            self.USE_CACHE,
+            context
+        )
+        self.rw_settings('w', 'use_cache', use_cache)
         # Perform checks and processing
-        # TODO: Check validity of input geometries.
+        repairs = edges.Repairs()
+        if target_resolution > 0:
+            tolerance, segments = edges.resolution_settings(
+                target_resolution,
+                edge_width
+            )
+            feedback.pushInfo(
+                f'Simplification tolerance {tolerance:g}, '
+                f'{segments} buffer segments per quarter circle.'
+            )
+        else:
+            tolerance, segments = edges.TOLERANCE, edges.SEGMENTS
+
+        fields = input_layer.fields()
+        fields.append(QgsField("h", QMetaType.Type.Int))
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            fields,
+            QgsWkbTypes.MultiPolygon,
+            input_layer.crs()
+        )
 
+        if sink is None:
+            raise QgsProcessingException(
+                self.invalidSinkError(parameters, self.OUTPUT)
+            )
+
+        # Return the cached result if the input and parameters are the same
+        result_cache = None
+        cache_writer = None
+        if use_cache:
+            result_cache = cache.ResultCache()
+            cache_key = cache.layer_key(
+                input_layer,
+                self.name(),
+                edge_width,
+                engine,
+                tile_size,
+                split_tiles,
+                shared_boundaries,
+                target_resolution
+            )
+            cached_layer = result_cache.get(cache_key)
+            if cached_layer is not None:
+                feedback.pushInfo(
+                    self.tr('Result cache hit, edges read from the cache.')
+                )
+                for feat in cache.cached_features(cached_layer, fields):
+                    if feedback.isCanceled():
+                        return {}
+                    sink.addFeature(feat, QgsFeatureSink.Flag.FastInsert)
+                return {self.OUTPUT: dest_id}
+            feedback.pushInfo(
+                self.tr('Result cache miss, edges computed and cached.')
+            )
+            cache_writer = result_cache.writer(
+                cache_key,
+                fields,
+                QgsWkbTypes.MultiPolygon,
+                input_layer.crs(),
+                context.transformContext()
+            )
+
+        if engine == 0:
+            features = self.fused_edges(
+                input_layer,
+                edge_width,
+                tolerance,
+                segments,
+                threads,
+                tile_size,
+                split_tiles,
+                shared_boundaries,
+                repairs,
+                feedback
+            )
+        else:
+            features = self.chained_edges(
+                parameters,
+                edge_width,
+                tolerance,
+                segments,
+                repairs,
+                context,
+                feedback
+            )
+
+        for feat in features:
+            if feedback.isCanceled():
+                break
+            src_attrs = feat.attributeMap()
+            feat.setFields(fields)
+            for attr in src_attrs:
+                feat[attr] = src_attrs[attr]
+            feat["h"] = braille.DIM["f"]
+            sink.addFeature(feat, QgsFeatureSink.Flag.FastInsert)
+            if cache_writer is not None:
+                cache_writer.addFeature(feat, QgsFeatureSink.Flag.FastInsert)
+
+        if cache_writer is not None:
+            del cache_writer
+            if feedback.isCanceled():
+                result_cache.discard(cache_key)
+            else:
+                result_cache.commit(cache_key)
+        if feedback.isCanceled():
+            return {}
+        repairs.report(feedback)
+
+        return {self.OUTPUT: dest_id}
+
+    def fused_edges(self, input_layer, edge_width, tolerance, segments,
+                    threads, tile_size, split_tiles, shared_boundaries,
+                    repairs, feedback):
+        """Extract the edges reading the input features once.
+
+        Every feature is buffered in memory and all the edges are
+            dissolved at the end, in a single feature (or a feature per
+            tile) with the attributes of the first input feature.
+        If 'shared_boundaries' is True, boundaries shared by adjacent
+            features are buffered once.
+        Invalid input geometries are repaired by 'repairs'.
+        """
+        first = None
+        geoms = []
+        for feat in input_layer.getFeatures():
+            if feedback.isCanceled():
+                return []
+            if first is None:
+                first = QgsFeature(feat)
+            geoms.append(feat.geometry())
+
+        if first is None:
+            return []
+        if shared_boundaries:
+            extract = edges.extract_shared_edges
+        else:
+            extract = edges.extract_edges
+        dissolved = extract(
+            geoms,
+            edge_width,
+            tolerance,
+            segments,
+            tile_size=tile_size,
+            split=split_tiles,
+            workers=threads,
+            feedback=feedback,
+            repairs=repairs,
+            preserve_topology=tolerance > edges.TOLERANCE
+        )
+        features = []
+        for geom in dissolved:
+            feat = QgsFeature(first)
+            feat.setGeometry(geom)
+            features.append(feat)
+        return features
+
+    def chained_edges(self, parameters, edge_width, tolerance, segments,
+                      repairs, context, feedback):
+        """Extract the edges running a chain of processing algorithms.
+
+        The invalid geometries of the temporary layers are repaired in
+            place by 'repairs', instead of fixing the whole layers.
+        Return the features of the last layer of the chain.
+        """
         outputs = {}
 
         # Cast input geometries to singlepart.
@@ -158,30 +500,25 @@ class ExtractEdges(QgsProcessingAlgorithm):
         )
 
         if feedback.isCanceled():
-            return {}
-
-        # fix singlepart generated geometries.
-        alg_params = {
-            'INPUT': outputs['singleparts']['OUTPUT'],
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
+            return []
+
+        # Repair invalid singlepart geometries.
+        outputs['fix_singleparts'] = {
+            'OUTPUT': self.repair_layer(
+                outputs['singleparts']['OUTPUT'],
+                repairs,
+                context
+            )
         }
 
-        outputs['fix_singleparts'] = processing.run(
-            'native:fixgeometries',
-            alg_params,
-            context=context,
-            feedback=None,
-            is_child_algorithm=True
-        )
-
         if feedback.isCanceled():
-            return {}
+            return []
 
-        # Simplify to tenths of milimeter as minimum distance between vertices.
+        # Simplify to the tolerance as minimum distance between vertices.
         alg_params = {
             'INPUT': outputs['fix_singleparts']['OUTPUT'],
             'METHOD': 0,  # Distance (Douglas-Peucker)
-            'TOLERANCE': 1, # 0.0001 m.
+            'TOLERANCE': tolerance,
             'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
         }
         outputs['simplify'] = processing.run(
@@ -193,23 +530,19 @@ class ExtractEdges(QgsProcessingAlgorithm):
         )
 
         if feedback.isCanceled():
-            return {}
-
-        # Fix simplified geometries.
-        alg_params = {
-            'INPUT': outputs['simplify']['OUTPUT'],
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
+            return []
+
+        # Repair invalid simplified geometries.
+        outputs['fix_simplified'] = {
+            'OUTPUT': self.repair_layer(
+                outputs['simplify']['OUTPUT'],
+                repairs,
+                context
+            )
         }
-        outputs['fix_simplified'] = processing.run(
-            'native:fixgeometries',
-            alg_params,
-            context=context,
-            feedback=None,
-            is_child_algorithm=True
-        )
 
         if feedback.isCanceled():
-            return {}
+            return []
 
         # Make the internal buffer.
         alg_params = {
@@ -219,7 +552,7 @@ class ExtractEdges(QgsProcessingAlgorithm):
             'INPUT': outputs['fix_simplified']['OUTPUT'],
             'JOIN_STYLE': 0,  # Round
             'MITER_LIMIT': 2,
-            'SEGMENTS': 5,
+            'SEGMENTS': segments,
             'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
         }
         outputs['buffer_int'] = processing.run(
@@ -231,23 +564,19 @@ class ExtractEdges(QgsProcessingAlgorithm):
         )
 
         if feedback.isCanceled():
-            return {}
-
-        # Fix internal buffer geometries.
-        alg_params = {
-            'INPUT': outputs['buffer_int']['OUTPUT'],
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
+            return []
+
+        # Repair invalid internal buffer geometries.
+        outputs['fix_bufferint'] = {
+            'OUTPUT': self.repair_layer(
+                outputs['buffer_int']['OUTPUT'],
+                repairs,
+                context
+            )
         }
-        outputs['fix_bufferint'] = processing.run(
-            'native:fixgeometries',
-            alg_params,
-            context=context,
-            feedback=None,
-            is_child_algorithm=True
-        )
 
         if feedback.isCanceled():
-            return {}
+            return []
 
         # Make the external buffer
         alg_params = {
@@ -257,7 +586,7 @@ class ExtractEdges(QgsProcessingAlgorithm):
             'INPUT': outputs['fix_simplified']['OUTPUT'],
             'JOIN_STYLE': 0,  # Round
             'MITER_LIMIT': 2,
-            'SEGMENTS': 5,
+            'SEGMENTS': segments,
             'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
         }
         outputs['buffer_ext'] = processing.run(
@@ -269,23 +598,19 @@ class ExtractEdges(QgsProcessingAlgorithm):
         )
 
         if feedback.isCanceled():
-            return {}
-
-        # Fix external buffer geometries.
-        alg_params = {
-            'INPUT': outputs['buffer_ext']['OUTPUT'],
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
+            return []
+
+        # Repair invalid external buffer geometries.
+        outputs['fix_bufferext'] = {
+            'OUTPUT': self.repair_layer(
+                outputs['buffer_ext']['OUTPUT'],
+                repairs,
+                context
+            )
         }
-        outputs['fix_bufferext'] = processing.run(
-            'native:fixgeometries',
-            alg_params,
-            context=context,
-            feedback=None,
-            is_child_algorithm=True
-        )
 
         if feedback.isCanceled():
-            return {}
+            return []
 
         # Make the difference between external and internal buffers.
         alg_params = {
@@ -302,7 +627,7 @@ class ExtractEdges(QgsProcessingAlgorithm):
         )
 
         if feedback.isCanceled():
-            return {}
+            return []
 
         # Dissolve the difference.
         alg_params = {
@@ -319,54 +644,52 @@ class ExtractEdges(QgsProcessingAlgorithm):
         )
 
         if feedback.isCanceled():
-            return {}
-
-        # Fix dissolved geometries.
-        alg_params = {
-            'INPUT': outputs['dissolved']['OUTPUT'],
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
+            return []
+
+        # Repair invalid dissolved geometries.
+        outputs['fix_dissolved'] = {
+            'OUTPUT': self.repair_layer(
+                outputs['dissolved']['OUTPUT'],
+                repairs,
+                context
+            )
         }
-        outputs['fix_dissolved'] = processing.run(
-            'native:fixgeometries',
-            alg_params,
-            context=context,
-            feedback=None,
-            is_child_algorithm=True
-        )
 
-        # OUTPUT
-        last_layer = context.getMapLayer(outputs['fix_dissolved']['OUTPUT'])
-        fields = last_layer.fields()
-        fields.append(QgsField("h", QMetaType.Type.Int))
-
-        (sink, dest_id) = self.parameterAsSink(
-            parameters,
-            self.OUTPUT,
-            context,
-            fields,
-            last_layer.wkbType(),
-            last_layer.crs()
-        )
+        if feedback.isCanceled():
+            return []
 
-        if sink is None:
-            raise QgsProcessingException(
-                self.invalidSinkError(parameters, self.OUTPUT)
-            )
+        last_layer = context.getMapLayer(outputs['fix_dissolved']['OUTPUT'])
+        return last_layer.getFeatures()
 
-        features = last_layer.getFeatures()
-        total = (100.0 / last_layer.featureCount()
-                    if last_layer.featureCount()
-                    else 0)
+    def repair_layer(self, layer_id, repairs, context):
+        """Repair the invalid geometries of a temporary layer in place.
 
-        for current, feat in enumerate(features):
-            if feedback.isCanceled():
-                break
-            src_attrs = feat.attributeMap()
-            feat.setFields(fields)
-            for attr in src_attrs:
-                feat[attr] = src_attrs[attr]
-            feat["h"] = braille.DIM["f"]
-            sink.addFeature(feat, QgsFeatureSink.Flag.FastInsert)
-            feedback.setProgress(int(current * total))
-
-        return {self.OUTPUT: dest_id}
+        Only the invalid geometries are fixed and rewritten, coerced to
+            the geometry type of the layer. Parts that do not fit in a
+            single part layer are added as new features with the same
+            attributes.
+        Return the id of the layer.
+        """
+        layer = context.getMapLayer(layer_id)
+        wkb_type = layer.wkbType()
+        fixed = {}
+        added = []
+        for feat in layer.getFeatures():
+            geom = feat.geometry()
+            repaired = repairs.fix(geom)
+            if repaired is geom:
+                continue
+            parts = repaired.coerceToType(wkb_type)
+            if not parts:
+                fixed[feat.id()] = QgsGeometry()
+                continue
+            fixed[feat.id()] = parts[0]
+            for part in parts[1:]:
+                extra = QgsFeature(feat)
+                extra.setGeometry(part)
+                added.append(extra)
+        if fixed:
+            layer.dataProvider().changeGeometryValues(fixed)
+        if added:
+            layer.dataProvider().addFeatures(added)
+        return layer_id
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""Produce the tactile sheets of an atlas from a coverage layer.
+
+************************************************************************
+    Name                : produceatlas_algorithm.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from qgis.core import (
+    Qgis,
+    QgsProcessing,
+    QgsProcessingException,
+    QgsProcessingOutputNumber,
+    QgsProcessingParameterDefinition,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterFolderDestination,
+    QgsProcessingParameterNumber,
+    QgsRectangle,
+    QgsSpatialIndex
+)
+
+from tactilemaps.processing.algorithms.producesheet_algorithm import (
+    ProduceTactileSheet
+)
+from tactilemaps.utils import scale
+
+
+class ProduceTactileAtlas(ProduceTactileSheet):
+    """Produce tactile atlas algorithm class."""
+
+    COVERAGE = 'COVERAGE'
+    SHEET_WORKERS = 'SHEET_WORKERS'
+    OUTPUT_FOLDER = 'OUTPUT_FOLDER'
+    SHEETS = 'SHEETS'
+
+    def createInstance(self):
+        """Return a new instance of the algorithm."""
+        return ProduceTactileAtlas()
+
+    def name(self):
+        """Return the algorithm name."""
+        return 'producetactileatlas'
+
+    def displayName(self):
+        """Return the algorithm display name."""
+        return self.tr('Produce tactile atlas')
+
+    def shortHelpString(self):
+        """Return the display help of the algortihm."""
+        return self.tr(
+            """
+            Produce the rasterized maps of the tactile sheets of an atlas, \
+                one for each feature of a coverage polygon layer.
+            Each sheet is produced as in Produce tactile sheet, with the \
+                scale computed for the extent of its coverage feature, \
+                and written as sheet_<id>.tif in the output folder.
+            The map layers are read once for the whole atlas and indexed, \
+                so each sheet only scales and burns its own features.
+            Several sheets can be rendered at once by worker threads.
+            All layers must have the same projected CRS as the coverage \
+                layer.
+            """
+        )
+
+    def shortDescription(self):
+        """Return the display description of the algorithm."""
+        return self.tr('Produce the tactile sheets of an atlas.')
+
+    def initAlgorithm(self, config=None):
+        """Define inputs and outputs of the algorithm."""
+        # PARAMETERS
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.COVERAGE,
+                self.tr('Coverage layer'),
+                [QgsProcessing.TypeVectorPolygon]
+            )
+        )
+        self.init_sheet_parameters()
+        workers_param = QgsProcessingParameterNumber(
+            self.SHEET_WORKERS,
+            self.tr('Number of sheets rendered at once'),
+            Qgis.ProcessingNumberParameterType.Integer,
+            minValue=1,
+            defaultValue=self.rw_settings('r', 'sheet_workers', 1)
+        )
+        workers_param.setFlags(
+            workers_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(workers_param)
+
+        # OUTPUTS
+        self.addParameter(
+            QgsProcessingParameterFolderDestination(
+                self.OUTPUT_FOLDER,
+                self.tr('Atlas folder')
+            )
+        )
+        self.addOutput(
+            QgsProcessingOutputNumber(
+                self.SHEETS,
+                self.tr('Number of sheets')
+            )
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """Produce tactile atlas process.
+
+        Return the folder of the rasterized sheets and the count of sheets.
+        """
+        # Get parameters and write settings
+        coverage = self.parameterAsSource(parameters, self.COVERAGE, context)
+        if coverage is None:
+            raise QgsProcessingException(
+                self.invalidSourceError(parameters, self.COVERAGE)
+            )
+        crs = coverage.sourceCrs()
+        settings = self.sheet_settings(parameters, context)
+        sheet_workers = self.parameterAsInt(
+            parameters,
+            self.SHEET_WORKERS,
+            context
+        )
+        self.rw_settings('w', 'sheet_workers', sheet_workers)
+        folder = self.parameterAsString(
+            parameters,
+            self.OUTPUT_FOLDER,
+            context
+        )
+        os.makedirs(folder, exist_ok=True)
+
+        # Perform checks
+        if not self.check_sheet_inputs(settings, crs, feedback):
+            return {}
+
+        # Compute the scale of each sheet
+        sheets = []
+        read_extent = QgsRectangle()
+        for feat in coverage.getFeatures():
+            if not feat.hasGeometry():
+                continue
+            scale_number, rectangle = scale.compute_scale(
+                feat.geometry().boundingBox(),
+                crs,
+                settings['width'],
+                settings['height'],
+                settings['margin'],
+                settings['multiple']
+            )
+            sheets.append((feat.id(), scale_number, rectangle))
+            read_extent.combineExtentWith(rectangle)
+        if not sheets:
+            feedback.reportError(
+                self.tr('The coverage layer has no features with geometry.'),
+                fatalError=True
+            )
+            return {}
+
+        # Read the features of all the sheets once, and index them
+        start_time = time.perf_counter()
+        areas, outlines, labels = self.read_sources(settings, read_extent)
+        indexed = [
+            (records, self.index_records(records))
+            for records in areas + outlines + [labels]
+        ]
+        feedback.pushInfo(
+            f'Layers read and indexed in '
+            f'{time.perf_counter() - start_time:.2f} s.'
+        )
+        if feedback.isCanceled():
+            return {}
+
+        def sheet_sources(rectangle):
+            selected = [
+                [records[i] for i in sorted(index.intersects(rectangle))]
+                for records, index in indexed
+            ]
+            return (
+                selected[:len(areas)],
+                selected[len(areas):-1],
+                selected[-1]
+            )
+
+        # Render the sheets
+        errors = set()
+        with ThreadPoolExecutor(max_workers=sheet_workers) as executor:
+            futures = {}
+            for fid, scale_number, rectangle in sheets:
+                output_file = os.path.join(folder, f'sheet_{fid}.tif')
+                future = executor.submit(
+                    self.render_sheet,
+                    sheet_sources(rectangle),
+                    settings,
+                    scale_number,
+                    rectangle,
+                    output_file,
+                    feedback
+                )
+                futures[future] = (fid, scale_number)
+            for done, future in enumerate(as_completed(futures), 1):
+                if feedback.isCanceled():
+                    for pending in futures:
+                        pending.cancel()
+                    return {}
+                timings, sheet_errors = future.result()
+                errors.update(sheet_errors)
+                fid, scale_number = futures[future]
+                seconds = sum(seconds for _, seconds in timings)
+                feedback.pushInfo(
+                    f'Sheet {fid} (1:{scale_number}) rendered in '
+                    f'{seconds:.2f} s.'
+                )
+                feedback.setProgress(int(100 * done / len(sheets)))
+
+        if errors:
+            msg = f"One or more not implemented characters:{sorted(errors)}."
+            feedback.pushWarning(msg)
+
+        return {self.OUTPUT_FOLDER: folder, self.SHEETS: len(sheets)}
+
+    def index_records(self, records):
+        """Return a spatial index of (geometry, value) records by position."""
+        index = QgsSpatialIndex()
+        for i, (geom, _) in enumerate(records):
+            index.addFeature(i, geom.boundingBox())
+        return index
@@ -0,0 +1,714 @@
+# -*- coding: utf-8 -*-
+"""Produce a tactile sheet from map layers in a single pass.
+
+************************************************************************
+    Name                : producesheet_algorithm.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import os
+import time
+
+import numpy as np
+
+from qgis.core import (
+    NULL,
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsExpression,
+    QgsExpressionContext,
+    QgsExpressionContextUtils,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsProcessingAlgorithm,
+    QgsProcessingMultiStepFeedback,
+    QgsProcessingOutputNumber,
+    QgsProcessingParameterDefinition,
+    QgsProcessingParameterExpression,
+    QgsProcessingParameterExtent,
+    QgsProcessingParameterMultipleLayers,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterRasterDestination,
+    QgsProcessingParameterString,
+    QgsProcessingParameterVectorLayer,
+    QgsRasterFileWriter,
+    QgsWkbTypes
+)
+from qgis.PyQt.QtCore import (
+    QCoreApplication,
+    QSettings
+)
+
+from tactilemaps.utils import braille, edges, rasterize, scale, smoothing
+
+
+class ProduceTactileSheet(QgsProcessingAlgorithm):
+    """Produce tactile sheet algorithm class."""
+
+    EXTENT = 'EXTENT'
+    WIDTH = 'WIDTH'
+    HEIGHT = 'HEIGHT'
+    MARGIN = 'MARGIN'
+    MULTIPLE = 'MULTIPLE'
+    AREA_LAYERS = 'AREA_LAYERS'
+    FIELD_NAME = 'FIELD_NAME'
+    EDGE_LAYERS = 'EDGE_LAYERS'
+    EDGE_WIDTH = 'EDGE_WIDTH'
+    LABEL_LAYER = 'LABEL_LAYER'
+    LABEL_EXPRESSION = 'LABEL_EXPRESSION'
+    PIXEL_SIZE = 'PIXEL_SIZE'
+    KERNEL_RADIUS = 'KERNEL_RADIUS'
+    KERNEL_SIGMA = 'KERNEL_SIGMA'
+    THREADS = 'THREADS'
+    OUTPUT_RASTER = 'OUTPUT_RASTER'
+    SCALE = 'SCALE'
+
+    # Name of the height value of the burned records.
+    HEIGHT_FIELD = 'h'
+
+    # Progress steps: read, scale, extract edges, write Braille, burn, and
+    # smooth and write.
+    STEPS = 6
+
+    # Rows smoothed and written at once, between progress updates.
+    BLOCK_ROWS = 256
+
+    def tr(self, string):
+        """Return a localized string."""
+        return QCoreApplication.translate('ProduceTactileSheet', string)
+
+    def rw_settings(self, mode, setting_name, value):
+        """Read and write tactilemaps settings.
+
+        If 'mode' is 'r', read the value of 'setting_name',
+            or a default 'value'.
+        If 'mode' is 'w', write the 'value' in the 'setting_name'.
+        """
+        directory = ['tactilemaps', self.name(), setting_name]
+        setting_path = '/'.join(directory)
+        if mode == 'w':
+            return QSettings().setValue(setting_path, value)
+        elif mode == 'r':
+            return QSettings().value(setting_path, value)
+        else:
+            raise ValueError("Invalid mode. Expected one of 'w' or 'r'.")
+
+    def createInstance(self):
+        """Return a new instance of the algorithm."""
+        return ProduceTactileSheet()
+
+    def name(self):
+        """Return the algorithm name."""
+        return 'producetactilesheet'
+
+    def displayName(self):
+        """Return the algorithm display name."""
+        return self.tr('Produce tactile sheet')
+
+    def group(self):
+        """Return the name of the group this algorithm belongs to."""
+        return ''
+
+    def groupId(self):
+        """Return the unique ID of the group this algorithm belongs to."""
+        return ''
+
+    def shortHelpString(self):
+        """Return the display help of the algortihm."""
+        return self.tr(
+            """
+            Produce the rasterized map of a tactile sheet, from an extent \
+                and the map layers, in a single pass.
+            The scale is computed as in Compute scale, and only the \
+                features on the sheet are read and scaled to it, as in \
+                Scale vector layer. The edges of the edge layers are \
+                extracted, and the labels of the label layer are written \
+                in Braille, as in Extract edges and Write Braille from \
+                layer. Everything is finally burned and smoothed as in \
+                Rasterize map.
+            The edges are simplified and buffered with the pixel size as \
+                target resolution, as in Extract edges.
+            The geometries are passed from a stage to the next in memory, \
+                without intermediate layers, and the time of each stage \
+                is reported in the log. The progress advances by stage, \
+                and the map is smoothed and written by blocks of rows, so \
+                it can be canceled at any stage.
+            All layers must have the same projected CRS as the extent.
+            Area layers are burned by the values of their height field, \
+                in order, and edges and Braille dots are burned on top \
+                of them with the standard Braille height.
+            """
+        )
+
+    def shortDescription(self):
+        """Return the display description of the algorithm."""
+        return self.tr('Produce the rasterized map of a tactile sheet.')
+
+    def initAlgorithm(self, config=None):
+        """Define inputs and outputs of the algorithm."""
+        # PARAMETERS
+        self.addParameter(
+            QgsProcessingParameterExtent(
+                self.EXTENT,
+                self.tr('Extent of the map')
+            )
+        )
+        self.init_sheet_parameters()
+
+        # OUTPUTS
+        self.addParameter(
+            QgsProcessingParameterRasterDestination(
+                self.OUTPUT_RASTER,
+                self.tr('Rasterized map')
+            )
+        )
+        self.addOutput(
+            QgsProcessingOutputNumber(
+                self.SCALE,
+                self.tr('Computed scale number')
+            )
+        )
+
+    def init_sheet_parameters(self):
+        """Define the inputs to lay out and render a sheet."""
+        advanced_flag = QgsProcessingParameterDefinition.FlagAdvanced
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.WIDTH,
+                self.tr('Width of the map (in tenths of millimeters)'),
+                Qgis.ProcessingNumberParameterType.Integer,
+                minValue=1,
+                defaultValue=self.rw_settings('r', 'width', 2100)
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.HEIGHT,
+                self.tr('Height of the map (in tenths of millimeters)'),
+                Qgis.ProcessingNumberParameterType.Integer,
+                minValue=1,
+                defaultValue=self.rw_settings('r', 'height', 2970)
+            )
+        )
+        margin_param = QgsProcessingParameterNumber(
+            self.MARGIN,
+            self.tr('Margin percentage'),
+            Qgis.ProcessingNumberParameterType.Integer,
+            minValue=0,
+            defaultValue=self.rw_settings('r', 'margin', 0)
+        )
+        margin_param.setFlags(margin_param.flags() | advanced_flag)
+        self.addParameter(margin_param)
+        multiple_param = QgsProcessingParameterNumber(
+            self.MULTIPLE,
+            self.tr('Multiple to round the scale denominator'),
+            Qgis.ProcessingNumberParameterType.Integer,
+            minValue=1,
+            defaultValue=self.rw_settings('r', 'multiple', 1)
+        )
+        multiple_param.setFlags(multiple_param.flags() | advanced_flag)
+        self.addParameter(multiple_param)
+
+        self.addParameter(
+            QgsProcessingParameterMultipleLayers(
+                self.AREA_LAYERS,
+                self.tr('Area layers'),
+                layerType=Qgis.ProcessingSourceType.VectorPolygon,
+                defaultValue=[]
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.FIELD_NAME,
+                self.tr('Height field name of the area layers'),
+                defaultValue=self.rw_settings('r', 'field_name', '')
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterMultipleLayers(
+                self.EDGE_LAYERS,
+                self.tr('Edge layers'),
+                layerType=Qgis.ProcessingSourceType.VectorPolygon,
+                optional=True
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.EDGE_WIDTH,
+                self.tr('Edge width (in tenths of millimeters)'),
+                Qgis.ProcessingNumberParameterType.Double,
+                minValue=0,
+                defaultValue=self.rw_settings('r', 'edge_width', 12)
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterVectorLayer(
+                self.LABEL_LAYER,
+                self.tr('Label layer'),
+                optional=True
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterExpression(
+                self.LABEL_EXPRESSION,
+                self.tr('Label text expression'),
+                defaultValue=self.rw_settings('r', 'label_expression', ''),
+                parentLayerParameterName=self.LABEL_LAYER,
+                optional=True
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PIXEL_SIZE,
+                self.tr('Pixel size'),
+                Qgis.ProcessingNumberParameterType.Double,
+                minValue=0.01,
+                defaultValue=self.rw_settings('r', 'pixel_size', 1)
+            )
+        )
+        radius_param = QgsProcessingParameterNumber(
+            self.KERNEL_RADIUS,
+            self.tr('Gaussian kernel radius (in pixels, 0 for automatic)'),
+            Qgis.ProcessingNumberParameterType.Double,
+            minValue=0,
+            defaultValue=self.rw_settings('r', 'kernel_radius', 5)
+        )
+        radius_param.setFlags(radius_param.flags() | advanced_flag)
+        self.addParameter(radius_param)
+        sigma_param = QgsProcessingParameterNumber(
+            self.KERNEL_SIGMA,
+            self.tr('Gaussian kernel sigma (in pixels)'),
+            Qgis.ProcessingNumberParameterType.Double,
+            minValue=0.01,
+            defaultValue=self.rw_settings('r', 'kernel_sigma', 1.0)
+        )
+        sigma_param.setFlags(sigma_param.flags() | advanced_flag)
+        self.addParameter(sigma_param)
+        threads_param = QgsProcessingParameterNumber(
+            self.THREADS,
+            self.tr('Number of threads'),
+            Qgis.ProcessingNumberParameterType.Integer,
+            minValue=1,
+            defaultValue=self.rw_settings('r', 'threads', 1)
+        )
+        threads_param.setFlags(threads_param.flags() | advanced_flag)
+        self.addParameter(threads_param)
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """Produce tactile sheet process.
+
+        Return the rasterized map of the sheet and the computed scale
+            denominator number.
+        """
+        # Get parameters and write settings
+        extent = self.parameterAsExtent(parameters, self.EXTENT, context)
+        crs = self.parameterAsExtentCrs(parameters, self.EXTENT, context)
+        settings = self.sheet_settings(parameters, context)
+        output_file = self.parameterAsOutputLayer(
+            parameters,
+            self.OUTPUT_RASTER,
+            context
+        )
+
+        # Perform checks
+        if not self.check_sheet_inputs(settings, crs, feedback):
+            return {}
+
+        # Compute scale
+        steps = QgsProcessingMultiStepFeedback(self.STEPS, feedback)
+        start_time = time.perf_counter()
+        scale_number, rectangle = scale.compute_scale(
+            extent,
+            crs,
+            settings['width'],
+            settings['height'],
+            settings['margin'],
+            settings['multiple']
+        )
+        feedback.pushInfo(f'Scale denominator: {scale_number}.')
+        timings = [('Compute scale', time.perf_counter() - start_time)]
+
+        # Read the features on the sheet
+        start_time = time.perf_counter()
+        sources = self.read_sources(settings, rectangle)
+        timings.append(('Read layers', time.perf_counter() - start_time))
+        if feedback.isCanceled():
+            return {}
+
+        sheet_timings, errors = self.render_sheet(
+            sources,
+            settings,
+            scale_number,
+            rectangle,
+            output_file,
+            steps,
+            multi_step=True
+        )
+        if feedback.isCanceled():
+            return {}
+        feedback.setProgress(100)
+        if errors:
+            msg = f"One or more not implemented characters:{sorted(errors)}."
+            feedback.pushWarning(msg)
+        for stage, seconds in timings + sheet_timings:
+            feedback.pushInfo(f'{stage}: {seconds:.2f} s.')
+
+        return {self.OUTPUT_RASTER: output_file, self.SCALE: scale_number}
+
+    def sheet_settings(self, parameters, context):
+        """Read the sheet parameters and write them as settings.
+
+        Return a dict of the values by setting name, with the layers and
+            the label expression string.
+        """
+        settings = {}
+        for name, param in (
+            ('width', self.WIDTH),
+            ('height', self.HEIGHT),
+            ('margin', self.MARGIN),
+            ('multiple', self.MULTIPLE),
+            ('threads', self.THREADS)
+        ):
+            settings[name] = self.parameterAsInt(parameters, param, context)
+        for name, param in (
+            ('edge_width', self.EDGE_WIDTH),
+            ('pixel_size', self.PIXEL_SIZE),
+            ('kernel_radius', self.KERNEL_RADIUS),
+            ('kernel_sigma', self.KERNEL_SIGMA)
+        ):
+            settings[name] = self.parameterAsDouble(
+                parameters,
+                param,
+                context
+            )
+        settings['field_name'] = self.parameterAsString(
+            parameters,
+            self.FIELD_NAME,
+            context
+        )
+        settings['label_expression'] = self.parameterAsExpression(
+            parameters,
+            self.LABEL_EXPRESSION,
+            context
+        )
+        for name, value in settings.items():
+            self.rw_settings('w', name, value)
+
+        settings['area_layers'] = self.parameterAsLayerList(
+            parameters,
+            self.AREA_LAYERS,
+            context
+        )
+        settings['edge_layers'] = self.parameterAsLayerList(
+            parameters,
+            self.EDGE_LAYERS,
+            context
+        )
+        settings['label_layer'] = self.parameterAsVectorLayer(
+            parameters,
+            self.LABEL_LAYER,
+            context
+        )
+        return settings
+
+    def check_sheet_inputs(self, settings, crs, feedback):
+        """Check the CRS, the layers and the label expression of a sheet.
+
+        Report the first error found to the feedback, and return False if
+            there is one, True otherwise.
+        """
+        if not crs.isValid() or crs.isGeographic():
+            msg = self.tr(
+                'The CRS of the extent must be a valid projected CRS.'
+            )
+            feedback.reportError(
+                msg,
+                fatalError=True
+            )
+            return False
+        layers = settings['area_layers'] + settings['edge_layers']
+        if settings['label_layer'] is not None:
+            layers.append(settings['label_layer'])
+        for layer in layers:
+            if layer.crs().authid() != crs.authid():
+                msg = self.tr(
+                    'The CRS of the layer {name} ({layer_authid}) is not \
+                    the same as the CRS of the extent ({authid}).'
+                )
+                feedback.reportError(
+                    msg.format(
+                        name=layer.name(),
+                        layer_authid=layer.crs().authid(),
+                        authid=crs.authid()
+                    ),
+                    fatalError=True
+                )
+                return False
+        field_name = settings['field_name']
+        for layer in settings['area_layers']:
+            idx = layer.fields().indexFromName(field_name)
+            if idx < 0 or not layer.fields()[idx].isNumeric():
+                msg = self.tr(
+                    "The layer {name} doesn't have a numeric field {field}."
+                )
+                feedback.reportError(
+                    msg.format(name=layer.name(), field=field_name),
+                    fatalError=True
+                )
+                return False
+        expression = QgsExpression(settings['label_expression'])
+        if settings['label_expression'] and expression.hasParserError():
+            feedback.reportError(
+                expression.parserErrorString(),
+                fatalError=True
+            )
+            return False
+        return True
+
+    def read_sources(self, settings, rectangle=None):
+        """Read the features of the layers of a sheet.
+
+        Only the features intersecting 'rectangle' are read, if it is
+            given.
+        Return a tuple of lists of records of the area layers, of the
+            edge layers, and the records of the label layer.
+        """
+        areas = [
+            self.read_features(layer, rectangle, settings['field_name'])
+            for layer in settings['area_layers']
+        ]
+        outlines = [
+            self.read_features(layer, rectangle)
+            for layer in settings['edge_layers']
+        ]
+        labels = []
+        if settings['label_layer'] is not None \
+                and settings['label_expression']:
+            labels = self.read_features(
+                settings['label_layer'],
+                rectangle,
+                expression=QgsExpression(settings['label_expression'])
+            )
+        return areas, outlines, labels
+
+    def read_features(self, layer, rectangle=None, field_name=None,
+                      expression=None):
+        """Read the geometries of a layer with a value.
+
+        Only the features intersecting 'rectangle' are read, if it is
+            given.
+        Return a list of (geometry, value) tuples, where the value is the
+            'field_name' value, the 'expression' text or None. Features
+            without geometry, or without text, are left out.
+        """
+        request = QgsFeatureRequest()
+        if rectangle is not None:
+            request.setFilterRect(rectangle)
+        if expression is not None:
+            expression_context = QgsExpressionContext(
+                QgsExpressionContextUtils.globalProjectLayerScopes(layer)
+            )
+            expression.prepare(expression_context)
+        elif field_name is not None:
+            request.setSubsetOfAttributes([field_name], layer.fields())
+        else:
+            request.setNoAttributes()
+        records = []
+        for feat in layer.getFeatures(request):
+            geom = feat.geometry()
+            if geom.isNull() or geom.isEmpty():
+                continue
+            value = None
+            if expression is not None:
+                expression_context.setFeature(feat)
+                value = expression.evaluate(expression_context)
+                if value is None or value == NULL or str(value) == '':
+                    continue
+                value = str(value)
+            elif field_name is not None:
+                value = feat[field_name]
+                if value is not None and value != NULL:
+                    value = float(value)
+                else:
+                    value = None
+            records.append((geom, value))
+        return records
+
+    def render_sheet(self, sources, settings, scale_number, rectangle,
+                     output_file, feedback, multi_step=False):
+        """Scale, lay out, burn and smooth the sources of a sheet.
+
+        'sources' is a tuple as returned by read_sources, and the records
+            are scaled from 'rectangle' by 'scale_number' to the sheet.
+        Return a tuple of the list of (stage, seconds) timings and the set
+            of not implemented characters of the labels. The feedback is
+            checked for cancelation between stages and blocks of rows.
+        If 'multi_step' is True, the feedback is a multi-step feedback of
+            STEPS steps, and gets the progress of each stage. Otherwise it
+            is only checked, so sheets can be rendered in worker threads.
+        """
+        areas, outlines, labels = sources
+        timings = []
+
+        def next_step(step):
+            if multi_step:
+                feedback.setCurrentStep(step)
+
+        # Scale
+        next_step(1)
+        start_time = time.perf_counter()
+        transformer = scale.scale_transform(rectangle.center(), scale_number)
+        sheet = QgsGeometry.fromRect(rectangle)
+        sheet.transform(transformer)
+        sheet_extent = sheet.boundingBox()
+        areas = [
+            self.scaled_records(records, transformer) for records in areas
+        ]
+        outlines = [
+            self.scaled_records(records, transformer) for records in outlines
+        ]
+        labels = self.scaled_records(labels, transformer)
+        timings.append(('Scale layers', time.perf_counter() - start_time))
+        if feedback.isCanceled():
+            return timings, set()
+
+        # Extract edges
+        next_step(2)
+        start_time = time.perf_counter()
+        tolerance, segments = edges.resolution_settings(
+            settings['pixel_size'],
+            settings['edge_width']
+        )
+        edge_geoms = []
+        for records in outlines:
+            edge_geoms += edges.extract_edges(
+                [geom for geom, _ in records],
+                settings['edge_width'],
+                tolerance,
+                segments,
+                workers=settings['threads'],
+                feedback=feedback,
+                preserve_topology=tolerance > edges.TOLERANCE
+            )
+        timings.append(('Extract edges', time.perf_counter() - start_time))
+        if feedback.isCanceled():
+            return timings, set()
+
+        # Write Braille
+        next_step(3)
+        start_time = time.perf_counter()
+        dots = []
+        errors = set()
+        for geom, text in labels:
+            if geom.isMultipart() or \
+                    geom.type() != QgsWkbTypes.PointGeometry:
+                anchor = geom.pointOnSurface().asPoint()
+            else:
+                anchor = geom.asPoint()
+            coords, char_errors = braille.layout(text, anchor.x(), anchor.y())
+            errors.update(char_errors)
+            dots.append(braille.stamp_dots(coords))
+        timings.append(('Write Braille', time.perf_counter() - start_time))
+        if feedback.isCanceled():
+            return timings, errors
+
+        # Burn
+        next_step(4)
+        start_time = time.perf_counter()
+        ps = settings['pixel_size']
+        kernel = smoothing.build_kernel(
+            'gaussian',
+            settings['kernel_radius'] * ps,
+            settings['kernel_sigma'] * ps,
+            ps
+        )
+        clip_extent = sheet_extent.buffered((kernel.size - 1) // 2 * ps)
+        burned_dataset = rasterize.create_dataset(
+            sheet_extent,
+            ps,
+            QgsCoordinateReferenceSystem('EPSG:3857').toWkt()
+        )
+        # Edges and Braille dots are burned over the areas.
+        raised = [(geom, braille.DIM['f']) for geom in edge_geoms + dots]
+        for records in areas + [raised]:
+            rasterize.burn_records(
+                burned_dataset,
+                self.wkb_records(records, clip_extent),
+                self.HEIGHT_FIELD
+            )
+        timings.append(('Burn', time.perf_counter() - start_time))
+        if feedback.isCanceled():
+            return timings, errors
+
+        # Smooth and write by blocks of rows
+        next_step(5)
+        start_time = time.perf_counter()
+        output_dataset = rasterize.create_output(
+            output_file,
+            QgsRasterFileWriter.driverForExtension(
+                os.path.splitext(output_file)[1]
+            ),
+            burned_dataset.RasterXSize,
+            burned_dataset.RasterYSize,
+            burned_dataset.GetProjection(),
+            burned_dataset.GetGeoTransform()
+        )
+        output_band = output_dataset.GetRasterBand(1)
+        burned_band = burned_dataset.GetRasterBand(1)
+        n_rows = burned_dataset.RasterYSize
+
+        def read_rows(offset, count):
+            return np.float32(
+                burned_band.ReadAsArray(
+                    0,
+                    offset,
+                    burned_dataset.RasterXSize,
+                    count
+                )
+            )
+
+        blocks = smoothing.iter_smoothed_blocks(
+            read_rows,
+            n_rows,
+            kernel,
+            self.BLOCK_ROWS
+        )
+        for offset, block in blocks:
+            if feedback.isCanceled():
+                break
+            output_band.WriteArray(rasterize.quantize(block), 0, offset)
+            if multi_step:
+                feedback.setProgress(100 * (offset + len(block)) / n_rows)
+        output_band = None
+        output_dataset = None
+        burned_band = None
+        burned_dataset = None
+        timings.append(('Smooth and write', time.perf_counter() - start_time))
+
+        return timings, errors
+
+    def scaled_records(self, records, transformer):
+        """Return copies of (geometry, value) records scaled to the sheet."""
+        scaled = []
+        for geom, value in records:
+            geom = QgsGeometry(geom)
+            geom.transform(transformer)
+            scaled.append((geom, value))
+        return scaled
+
+    def wkb_records(self, records, clip_extent):
+        """Yield (WKB, value) records of geometries clipped to an extent."""
+        for geom, value in records:
+            geom = geom.clipped(clip_extent)
+            if not geom.isEmpty():
+                yield bytes(geom.asWkb()), value
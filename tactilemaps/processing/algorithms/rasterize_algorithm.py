@@ -14,31 +14,31 @@
 """
 
 import os
+import time
 import numpy as np
 
 from qgis.core import (
     Qgis,
-    QgsFeature,
-    QgsField,
-    QgsGeometry,
-    QgsProcessing,
+    QgsFeatureSource,
     QgsProcessingAlgorithm,
+    QgsProcessingParameterDefinition,
+    QgsProcessingParameterEnum,
     QgsProcessingParameterExtent,
     QgsProcessingParameterMultipleLayers,
     QgsProcessingParameterNumber,
     QgsProcessingParameterRasterDestination,
     QgsProcessingParameterString,
+    QgsProcessingUtils,
     QgsRasterFileWriter,
     QgsVectorLayer,
     QgsWkbTypes
 )
 from qgis.PyQt.QtCore import (
     QCoreApplication,
-    QSettings,
-    QVariant
+    QSettings
 )
-import processing
-from osgeo import gdal
+
+from tactilemaps.utils import rasterize, smoothing
 
 
 class RasterizeMap(QgsProcessingAlgorithm):
@@ -48,6 +48,14 @@ class RasterizeMap(QgsProcessingAlgorithm):
     FIELD_NAME   = "FIELD_NAME"
     EXTENT       = "EXTENT"
     PIXEL_SIZE = "PIXEL_SIZE"
+    KERNEL = "KERNEL"
+    KERNEL_RADIUS = "KERNEL_RADIUS"
+    KERNEL_SIGMA = "KERNEL_SIGMA"
+    SMOOTHING_METHOD = "SMOOTHING_METHOD"
+    BLOCK_SIZE = "BLOCK_SIZE"
+    THREADS = "THREADS"
+    OUTPUT_TYPE = "OUTPUT_TYPE"
+    HEIGHT_FACTOR = "HEIGHT_FACTOR"
     OUTPUT_RASTER = "OUTPUT_RASTER"
 
     def tr(self, string):
@@ -98,8 +106,30 @@ class RasterizeMap(QgsProcessingAlgorithm):
             All layers must have the same CRS and a field with the value \
                 to be rasterized.
             All units are in tenths of milimeter.
+            Only the features intersecting the map extent are read, and \
+                their geometries are clipped to the extent expanded by the \
+                kernel radius, whether they are read by GDAL or by QGIS.
             Raster output will be burned with zero values where no polygon \
                 is present.
+            The map is smoothed with a Gaussian, box or cone kernel of \
+                the given radius. The kernel radius and sigma are in \
+                pixels, so the default kernel is the same at any pixel \
+                size. A radius of zero is automatic, three times the \
+                sigma, where the Gaussian weights become negligible.
+            The smoothing method only changes how the filter is \
+                computed: the sliding window is exact, FFT is faster for \
+                large kernels, and automatic chooses by the kernel size.
+            Large maps can be smoothed and written by blocks of rows, \
+                bounding the memory used by the size of the block instead \
+                of the size of the map.
+            Layers that are not read directly by GDAL (as database layers) \
+                can be read by several threads while the map is burned, \
+                always in the order of the layers.
+            The map is smoothed in floating point, but it can be written \
+                with integer fixed point heights: each height is multiplied \
+                by the height factor and rounded, and the factor inverse is \
+                set as the band scale. GeoTIFF outputs are tiled and \
+                compressed with a predictor.
             """
         )
 
@@ -109,6 +139,46 @@ class RasterizeMap(QgsProcessingAlgorithm):
 
     def initAlgorithm(self, config=None):
         """Define the inputs and outputs of the algorithm."""
+        self.init_map_parameters()
+
+        output_type_param = QgsProcessingParameterEnum(
+            self.OUTPUT_TYPE,
+            "Output data type",
+            options=[
+                "Float32",
+                "UInt8 (fixed point heights)",
+                "UInt16 (fixed point heights)"
+            ],
+            defaultValue=int(self.rw_settings('r', 'output_type', 0))
+        )
+        output_type_param.setFlags(
+            output_type_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(output_type_param)
+
+        height_factor_param = QgsProcessingParameterNumber(
+            self.HEIGHT_FACTOR,
+            "Fixed point height factor (stored value = height * factor)",
+            type=Qgis.ProcessingNumberParameterType.Double,
+            minValue=0.001,
+            defaultValue=self.rw_settings('r', 'height_factor', 10)
+        )
+        height_factor_param.setFlags(
+            height_factor_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(height_factor_param)
+
+        self.addParameter(
+            QgsProcessingParameterRasterDestination(
+                self.OUTPUT_RASTER,
+                "Rasterized map"
+            )
+        )
+
+    def init_map_parameters(self):
+        """Define the inputs to burn and smooth the map."""
         self.addParameter(
             QgsProcessingParameterMultipleLayers(
                 self.INPUT_LAYERS,
@@ -145,14 +215,168 @@ class RasterizeMap(QgsProcessingAlgorithm):
         )
 
         self.addParameter(
-            QgsProcessingParameterRasterDestination(
-                self.OUTPUT_RASTER,
-                "Rasterized map"
+            QgsProcessingParameterEnum(
+                self.KERNEL,
+                "Smoothing kernel",
+                options=["Gaussian", "Box", "Cone"],
+                defaultValue=int(self.rw_settings('r', 'kernel', 0))
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.KERNEL_RADIUS,
+                "Kernel radius (in pixels, 0 for automatic)",
+                type=Qgis.ProcessingNumberParameterType.Double,
+                minValue=0,
+                defaultValue=self.rw_settings('r', 'kernel_radius', 5)
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.KERNEL_SIGMA,
+                "Gaussian kernel sigma (in pixels)",
+                type=Qgis.ProcessingNumberParameterType.Double,
+                minValue=0.01,
+                defaultValue=self.rw_settings('r', 'kernel_sigma', 1.0)
+            )
+        )
+
+        smoothing_param = QgsProcessingParameterEnum(
+            self.SMOOTHING_METHOD,
+            "Smoothing method",
+            options=["Automatic", "Sliding window", "FFT"],
+            defaultValue=int(self.rw_settings('r', 'smoothing_method', 0))
+        )
+        smoothing_param.setFlags(
+            smoothing_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(smoothing_param)
+
+        block_param = QgsProcessingParameterNumber(
+            self.BLOCK_SIZE,
+            "Rows per smoothing block (0 to smooth the whole raster at once)",
+            type=Qgis.ProcessingNumberParameterType.Integer,
+            minValue=0,
+            defaultValue=self.rw_settings('r', 'block_size', 0)
+        )
+        block_param.setFlags(
+            block_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(block_param)
+
+        threads_param = QgsProcessingParameterNumber(
+            self.THREADS,
+            "Number of threads reading the layers",
+            type=Qgis.ProcessingNumberParameterType.Integer,
+            minValue=1,
+            defaultValue=self.rw_settings('r', 'threads', 1)
+        )
+        threads_param.setFlags(
+            threads_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(threads_param)
+
     def processAlgorithm(self, parameters, context, feedback):
         """Rasterize polygon layers by a field value."""
+        output_type = self.parameterAsEnum(
+            parameters,
+            self.OUTPUT_TYPE,
+            context
+        )
+        self.rw_settings('w', 'output_type', output_type)
+
+        height_factor = self.parameterAsDouble(
+            parameters,
+            self.HEIGHT_FACTOR,
+            context
+        )
+        self.rw_settings('w', 'height_factor', height_factor)
+
+        smoothed = self.smooth_map(parameters, context, feedback)
+        if smoothed is None:
+            return {}
+        rasterized_dataset, blocks = smoothed
+
+        # Round
+        crs = rasterized_dataset.GetProjection()
+        geotransform = rasterized_dataset.GetGeoTransform()
+        x_size = rasterized_dataset.RasterXSize
+        y_size = rasterized_dataset.RasterYSize
+
+        outputFile = self.parameterAsOutputLayer(
+            parameters,
+            self.OUTPUT_RASTER,
+            context)
+
+        output_format = QgsRasterFileWriter.driverForExtension(
+            os.path.splitext(outputFile)[1]
+        )
+
+        rounded_dataset = rasterize.create_output(
+            outputFile,
+            output_format,
+            x_size,
+            y_size,
+            crs,
+            geotransform,
+            output_type,
+            height_factor
+        )
+        rounded_band = rounded_dataset.GetRasterBand(1)
+
+        start_time = time.perf_counter()
+        clipped = 0
+        for offset, rounded_block in blocks:
+            if feedback.isCanceled():
+                break
+            clipped += rasterize.clipped_cells(
+                rounded_block,
+                output_type,
+                height_factor
+            )
+            rounded_band.WriteArray(
+                rasterize.quantize(rounded_block, output_type, height_factor),
+                0,
+                offset
+            )
+            feedback.setProgress(
+                int(100 * (offset + rounded_block.shape[0]) / y_size)
+            )
+        rounded_band = None
+        rounded_dataset = None
+        blocks = None
+        rasterized_dataset = None
+
+        if feedback.isCanceled():
+            return {}
+        if clipped:
+            feedback.pushWarning(
+                f"{clipped} cells exceed the range of the output data type "
+                f"at a height factor of {height_factor:g}, and were clipped. "
+                f"Use a lower height factor or a larger data type."
+            )
+        feedback.pushInfo(
+            f"Map smoothed and written in "
+            f"{time.perf_counter() - start_time:.2f} s."
+        )
+
+        return {self.OUTPUT_RASTER: outputFile}
+
+    def smooth_map(self, parameters, context, feedback, default_block=0):
+        """Burn the input layers and smooth the map by blocks of rows.
+
+        If the block size parameter is 0, the map is smoothed by blocks of
+            'default_block' rows, or at once if it is 0 too.
+        Return a tuple of the burned dataset, which has the grid of the
+            map, and a generator of (offset, block) smoothed blocks of
+            rows, or None if the inputs are not valid or the process is
+            canceled.
+        """
         layer_list = self.parameterAsLayerList(
             parameters,
             self.INPUT_LAYERS,
@@ -172,18 +396,63 @@ class RasterizeMap(QgsProcessingAlgorithm):
             context
         )
 
-        ps = self.parameterAsInt(
+        ps = self.parameterAsDouble(
             parameters,
             self.PIXEL_SIZE,
             context
         )
         self.rw_settings('w', 'pixel_size', ps)
 
+        kernel_family = self.parameterAsEnum(
+            parameters,
+            self.KERNEL,
+            context
+        )
+        self.rw_settings('w', 'kernel', kernel_family)
+
+        kernel_radius = self.parameterAsDouble(
+            parameters,
+            self.KERNEL_RADIUS,
+            context
+        )
+        self.rw_settings('w', 'kernel_radius', kernel_radius)
+
+        kernel_sigma = self.parameterAsDouble(
+            parameters,
+            self.KERNEL_SIGMA,
+            context
+        )
+        self.rw_settings('w', 'kernel_sigma', kernel_sigma)
+
+        smoothing_method = self.parameterAsEnum(
+            parameters,
+            self.SMOOTHING_METHOD,
+            context
+        )
+        self.rw_settings('w', 'smoothing_method', smoothing_method)
+
+        block_size = self.parameterAsInt(
+            parameters,
+            self.BLOCK_SIZE,
+            context
+        )
+        self.rw_settings('w', 'block_size', block_size)
+        if not block_size:
+            block_size = default_block
+
+        threads = self.parameterAsInt(
+            parameters,
+            self.THREADS,
+            context
+        )
+        self.rw_settings('w', 'threads', threads)
+
         if not layer_list:
             feedback.reportError(
                 "There is not any layer selected to rasterize.",
                 fatalError=True
             )
+            return None
 
         validated_layers = []
         reference_crs = None
@@ -193,14 +462,14 @@ class RasterizeMap(QgsProcessingAlgorithm):
                     f"Layer '{lyr.name()}' is not a vector layer.",
                     fatalError=True
                 )
-                return {}
+                return None
 
             if lyr.geometryType() != QgsWkbTypes.PolygonGeometry:
                 feedback.reportError(
                     f"Layer '{lyr.name()}' is not a polygon layer.",
                     fatalError=True
                 )
-                return {}
+                return None
 
             if reference_crs is None:
                 reference_crs = lyr.crs()
@@ -211,7 +480,7 @@ class RasterizeMap(QgsProcessingAlgorithm):
                         f"than the first layer ({reference_crs.authid()}).",
                         fatalError=True
                     )
-                    return {}
+                    return None
 
             idx = lyr.fields().indexFromName(field_name)
             if idx < 0:
@@ -219,7 +488,7 @@ class RasterizeMap(QgsProcessingAlgorithm):
                     f"Layer '{lyr.name()}' doesn't have a field '{field_name}'.",
                     fatalError=True
                 )
-                return {}
+                return None
 
             fld = lyr.fields()[idx]
             if not fld.isNumeric():
@@ -227,108 +496,81 @@ class RasterizeMap(QgsProcessingAlgorithm):
                     f"Layer '{lyr.name()}' field '{field_name}' is not numeric.",
                     fatalError=True
                 )
-                return {}
+                return None
+
+            spatial_index = lyr.hasSpatialIndex()
+            if spatial_index == QgsFeatureSource.SpatialIndexNotPresent:
+                feedback.pushInfo(
+                    f"Layer '{lyr.name()}' has no spatial index; creating one "
+                    f"would speed up reading the map extent."
+                )
 
             validated_layers.append(lyr)
 
-        # Merge all layers into a single layer
-        uri = f"MultiPolygon?crs={reference_crs.authid()}"
-        mem_layer = QgsVectorLayer(uri, "merged_polygons", "memory")
-        prov = mem_layer.dataProvider()
+        # The kernel parameters are in pixels, and kernels in map units.
+        kernel = smoothing.build_kernel(
+            smoothing.KERNELS[kernel_family],
+            kernel_radius * ps,
+            kernel_sigma * ps,
+            ps
+        )
+        kernel_margin = (kernel.size - 1) // 2 * ps
 
-        prov.addAttributes([QgsField(field_name, QVariant.Double)])
-        mem_layer.updateFields()
+        # Burn all layers into a single dataset
+        burned_path = None
+        if block_size:
+            burned_path = QgsProcessingUtils.generateTempFilename(
+                'burned.tif'
+            )
+        rasterized_dataset = rasterize.create_dataset(
+            extent_map,
+            ps,
+            reference_crs.toWkt(),
+            burned_path
+        )
 
+        # Only features in the map extent are read, and their geometries are
+        # clipped to the extent expanded by the kernel radius.
         total_feats = 0
-        for lyr in validated_layers:
-            feats = lyr.getFeatures()
-            for feat in feats:
-                # Field name will be the only attribute
-                val = feat[field_name]
-                g = feat.geometry()
-                new_feat = QgsFeature(mem_layer.fields())
-                new_feat.setGeometry(QgsGeometry(g))
-                new_feat.setAttribute(field_name, val)
-                prov.addFeature(new_feat)
-                total_feats += 1
-                if feedback.isCanceled():
-                    return {}
+        burned_layers = rasterize.burn_layers(
+            rasterized_dataset,
+            validated_layers,
+            field_name,
+            extent=extent_map,
+            clip_extent=extent_map.buffered(kernel_margin),
+            workers=threads,
+            feedback=feedback
+        )
+        for lyr, count, seconds in burned_layers:
+            total_feats += count
+            feedback.pushInfo(
+                f"Layer '{lyr.name()}': {count} features burned in "
+                f"{seconds:.2f} s."
+            )
+        if feedback.isCanceled():
+            return None
 
         if total_feats == 0:
             feedback.reportError(
-                "No features found in input layers.",
+                "No features found in input layers within the map extent.",
                 fatalError=True
             )
-        mem_layer.updateExtents()
-
-        # Rasterize
-        xmin = extent_map.xMinimum()
-        xmax = extent_map.xMaximum()
-        ymin = extent_map.yMinimum()
-        ymax = extent_map.yMaximum()
-        extent_str = f"{xmin},{xmax},{ymin},{ymax}"
-
-        params_raster = {
-            'INPUT': mem_layer,
-            'FIELD': field_name,
-            'BURN': 0,
-            'USE_Z': False,
-            'UNITS': 1, # 0=georeferenced units, 1=pixel size units
-            'WIDTH': ps,
-            'HEIGHT': ps,
-            'EXTENT': extent_str,
-            'NODATA': None,
-            'OPTIONS': '',
-            'DATA_TYPE': 5, # 0=Byte, 1=UInt16, 2=Int16, 3=UInt32, 4=Int32, 5=Float32, 6=Float64
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
-        }
-
-        rasterized = processing.run("gdal:rasterize", params_raster, context=context, feedback=feedback)
-        rasterized_output = rasterized['OUTPUT']
-
-        # Round
-        rasterized_dataset = gdal.Open(rasterized_output, gdal.GA_ReadOnly)
-        crs = rasterized_dataset.GetProjection()
-        geotransform = rasterized_dataset.GetGeoTransform()
-        arr = np.float32(rasterized_dataset.GetRasterBand(1).ReadAsArray())
-        rasterized_dataset = None
-
-        # TODO: Add parameters for kernel radius and sigma
-        RADIUS = 5
-        SIGMA = 1.0
-
-        dist = np.linspace(-RADIUS, RADIUS, RADIUS*2+1)
-
-        kernel = np.exp(-dist**2 / (2*SIGMA**2))
-
-        kernel = kernel / kernel.sum()
 
-        def apply_kernel(vector, kernel):
-            return np.convolve(vector, kernel, mode='same')
-
-        rounded_cols = np.apply_along_axis(apply_kernel, 0, arr, kernel)
-        rounded_arr = np.apply_along_axis(apply_kernel, 1, rounded_cols, kernel)
-
-        outputFile = self.parameterAsOutputLayer(
-            parameters,
-            self.OUTPUT_RASTER,
-            context)
+        def read_rows(offset, count):
+            return np.float32(
+                rasterized_dataset.GetRasterBand(1).ReadAsArray(
+                    0,
+                    offset,
+                    rasterized_dataset.RasterXSize,
+                    count
+                )
+            )
 
-        output_format = QgsRasterFileWriter.driverForExtension(
-            os.path.splitext(outputFile)[1]
+        blocks = smoothing.iter_smoothed_blocks(
+            read_rows,
+            rasterized_dataset.RasterYSize,
+            kernel,
+            block_size,
+            smoothing.METHODS[smoothing_method]
         )
-
-        rounded_dataset = gdal.GetDriverByName(output_format).Create(
-            outputFile,
-            rounded_arr.shape[1],
-            rounded_arr.shape[0],
-            1,
-            gdal.GDT_Float32,
-            options=['COMPRESS=LZW']
-        )
-        rounded_dataset.SetProjection(crs)
-        rounded_dataset.SetGeoTransform(geotransform)
-        rounded_dataset.GetRasterBand(1).WriteArray(rounded_arr)
-        rounded_dataset = None
-
-        return {self.OUTPUT_RASTER: outputFile}
+        return rasterized_dataset, blocks
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""Rasterize the edges of polygon layers with a distance transform.
+
+************************************************************************
+    Name                : rasterizeedges_algorithm.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import os
+import time
+from math import ceil
+
+import numpy as np
+
+from qgis.core import (
+    Qgis,
+    QgsProcessingAlgorithm,
+    QgsProcessingParameterExtent,
+    QgsProcessingParameterMultipleLayers,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterRasterDestination,
+    QgsRasterFileWriter,
+    QgsVectorLayer,
+    QgsWkbTypes
+)
+from qgis.PyQt.QtCore import (
+    QCoreApplication,
+    QSettings
+)
+
+from tactilemaps.utils import braille, distance, rasterize
+
+
+class RasterizeEdges(QgsProcessingAlgorithm):
+    """Rasterize the edges of polygon layers."""
+
+    INPUT_LAYERS = 'INPUT_LAYERS'
+    WIDTH = 'WIDTH'
+    EXTENT = 'EXTENT'
+    PIXEL_SIZE = 'PIXEL_SIZE'
+    OUTPUT_RASTER = 'OUTPUT_RASTER'
+
+    def tr(self, string):
+        """Return a localized string."""
+        return QCoreApplication.translate('RasterizeEdges', string)
+
+    def rw_settings(self, mode, setting_name, value):
+        """Read and write tactilemaps settings.
+
+        If 'mode' is 'r', read the value of 'setting_name',
+            or a default 'value'.
+        If 'mode' is 'w', write the 'value' in the 'setting_name'.
+        """
+        directory = ['tactilemaps', self.name(), setting_name]
+        setting_path = '/'.join(directory)
+        if mode == 'w':
+            return QSettings().setValue(setting_path, value)
+        elif mode == 'r':
+            return QSettings().value(setting_path, value)
+        else:
+            raise ValueError("Invalid mode. Expected one of 'w' or 'r'.")
+
+    def createInstance(self):
+        """Return a new instance of the algorithm."""
+        return RasterizeEdges()
+
+    def name(self):
+        """Return the algorithm name."""
+        return 'rasterizeedges'
+
+    def displayName(self):
+        """Return the algorithm display name."""
+        return self.tr('Rasterize edges')
+
+    def group(self):
+        """Return the name of the group this algorithm belongs to."""
+        return ''
+
+    def groupId(self):
+        """Return the unique ID of the group this algorithm belongs to."""
+        return ''
+
+    def shortHelpString(self):
+        """Return the display help of the algortihm."""
+        return self.tr(
+            """
+            Rasterize the edges of polygon layers, as a band of the given \
+                width around their boundaries, without buffering them.
+            The boundaries are burned into a grid, on every pixel they \
+                touch, and the band is found with a distance transform \
+                bounded by half of the width.
+            All units are in tenths of milimeter. The grid is computed \
+                from the extent and pixel size by the same function as in \
+                Rasterize map, so the output can be combined with its \
+                output pixel by pixel. Boundaries outside the map extent, \
+                but closer to it than half of the width, are burned too, \
+                so the bands along the map border are complete.
+            Pixels in the band get the standard height of the edges, and \
+                the rest are zero.
+            """
+        )
+
+    def shortDescription(self):
+        """Return the display description of the algorithm."""
+        return self.tr('Rasterize the edges of polygon layers.')
+
+    def initAlgorithm(self, config=None):
+        """Define the inputs and outputs of the algorithm."""
+        self.addParameter(
+            QgsProcessingParameterMultipleLayers(
+                self.INPUT_LAYERS,
+                self.tr('Polygon layers'),
+                layerType=Qgis.ProcessingSourceType.VectorPolygon,
+                defaultValue=[]
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.WIDTH,
+                self.tr('Edge width (in tenths of millimeters)'),
+                type=Qgis.ProcessingNumberParameterType.Double,
+                minValue=0,
+                defaultValue=self.rw_settings('r', 'edge_width', 12)
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterExtent(
+                self.EXTENT,
+                self.tr('Map extent'),
+                defaultValue=None
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PIXEL_SIZE,
+                self.tr('Pixel size'),
+                type=Qgis.ProcessingNumberParameterType.Double,
+                minValue=0.01,
+                defaultValue=self.rw_settings('r', 'pixel_size', 1)
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterRasterDestination(
+                self.OUTPUT_RASTER,
+                self.tr('Rasterized edges')
+            )
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """Rasterize the edges of polygon layers."""
+        layer_list = self.parameterAsLayerList(
+            parameters,
+            self.INPUT_LAYERS,
+            context
+        )
+        edge_width = self.parameterAsDouble(
+            parameters,
+            self.WIDTH,
+            context
+        )
+        self.rw_settings('w', 'edge_width', edge_width)
+        extent_map = self.parameterAsExtent(
+            parameters,
+            self.EXTENT,
+            context
+        )
+        ps = self.parameterAsDouble(
+            parameters,
+            self.PIXEL_SIZE,
+            context
+        )
+        self.rw_settings('w', 'pixel_size', ps)
+        output_file = self.parameterAsOutputLayer(
+            parameters,
+            self.OUTPUT_RASTER,
+            context
+        )
+
+        if not layer_list:
+            feedback.reportError(
+                self.tr('There is not any layer selected to rasterize.'),
+                fatalError=True
+            )
+            return {}
+        reference_crs = layer_list[0].crs()
+        for lyr in layer_list:
+            if not isinstance(lyr, QgsVectorLayer) \
+                    or lyr.geometryType() != QgsWkbTypes.PolygonGeometry:
+                msg = self.tr("Layer '{name}' is not a polygon layer.")
+                feedback.reportError(
+                    msg.format(name=lyr.name()),
+                    fatalError=True
+                )
+                return {}
+            if lyr.crs() != reference_crs:
+                msg = self.tr(
+                    "Layer '{name}' has a different CRS than the first \
+                    layer."
+                )
+                feedback.reportError(
+                    msg.format(name=lyr.name()),
+                    fatalError=True
+                )
+                return {}
+
+        # Burn the boundaries on the grid of Rasterize map, padded so the
+        # boundaries outside the map still reach the band
+        start_time = time.perf_counter()
+        half_width = edge_width / 2.0
+        pad = int(ceil(half_width / ps)) + 1
+        x_size, y_size, geotransform = rasterize.map_grid(extent_map, ps)
+        burned_dataset = rasterize.create_dataset(
+            extent_map,
+            ps,
+            reference_crs.toWkt(),
+            pad=pad
+        )
+        clip_extent = extent_map.buffered((pad + 1) * ps)
+        for lyr in layer_list:
+            if feedback.isCanceled():
+                return {}
+            count = rasterize.burn_boundaries(
+                burned_dataset,
+                lyr,
+                clip_extent,
+                clip_extent
+            )
+            feedback.pushInfo(
+                f"Layer '{lyr.name()}': {count} boundaries burned."
+            )
+        boundaries = burned_dataset.GetRasterBand(1).ReadAsArray() > 0
+        feedback.pushInfo(
+            f'Boundaries burned in {time.perf_counter() - start_time:.2f} s.'
+        )
+        feedback.setProgress(50)
+        if feedback.isCanceled():
+            return {}
+
+        # Find the edge band and write it
+        start_time = time.perf_counter()
+        edges = distance.band(boundaries, half_width / ps)[pad:-pad, pad:-pad]
+        heights = np.where(edges, braille.DIM['f'], 0.0)
+        output_dataset = rasterize.create_output(
+            output_file,
+            QgsRasterFileWriter.driverForExtension(
+                os.path.splitext(output_file)[1]
+            ),
+            x_size,
+            y_size,
+            burned_dataset.GetProjection(),
+            geotransform
+        )
+        output_band = output_dataset.GetRasterBand(1)
+        output_band.WriteArray(rasterize.quantize(heights))
+        output_band = None
+        output_dataset = None
+        burned_dataset = None
+        feedback.pushInfo(
+            f'Edge band computed and written in '
+            f'{time.perf_counter() - start_time:.2f} s.'
+        )
+        feedback.setProgress(100)
+
+        return {self.OUTPUT_RASTER: output_file}
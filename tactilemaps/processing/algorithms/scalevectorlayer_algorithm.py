@@ -20,6 +20,8 @@ from qgis.core import (
     QgsProcessing,
     QgsProcessingAlgorithm,
     QgsProcessingException,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterDefinition,
     QgsProcessingParameterFeatureSink,
     QgsProcessingParameterNumber,
     QgsProcessingParameterVectorLayer
@@ -28,7 +30,8 @@ from qgis.PyQt.QtCore import (
     QCoreApplication,
     QSettings
 )
-from qgis.PyQt.QtGui import QTransform
+
+from tactilemaps.utils import cache, scale
 
 
 class ScaleVectorLayer(QgsProcessingAlgorithm):
@@ -37,6 +40,7 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
     INPUT = 'INPUT'
     EXTENT = 'EXTENT'
     SCALE = 'SCALE'
+    USE_CACHE = 'USE_CACHE'
     OUTPUT = 'OUTPUT'
 
     def tr(self, string):
@@ -93,6 +97,10 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
                 map to print, in tenths of milimeter.
             EPSG:3857 CRS will be assigned to the \
                 output layer, without reprojecting it.
+            With the result cache, off by default, the scaled layer is \
+                kept on disk, keyed by the content of the input layer, \
+                the scale and the center of the extent, and returned at \
+                once when nothing changed.
             """
         )
 
@@ -125,6 +133,17 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
             defaultValue=self.rw_settings('r', 'scale', 1)
         )
         self.addParameter(scale_param)
+        cache_param = QgsProcessingParameterBoolean(
+            self.USE_CACHE,
+            self.tr('Use the result cache'),
+            defaultValue=self.rw_settings('r', 'use_cache', False)
+            in (True, 'true')
+        )
+        cache_param.setFlags(
+            cache_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(cache_param)
         # OUTPUTS
         scaled_output = QgsProcessingParameterFeatureSink(
             self.OUTPUT,
@@ -158,10 +177,120 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
             context
         )
         self.rw_settings('w', 'scale', scale_number)
+        use_cache = self.parameterAsBool(
+            parameters,
+            self.USE_CACHE,
+            context
+        )
+        self.rw_settings('w', 'use_cache', use_cache)
         # Perform checks and processing
-        input_crs = input_layer.crs()
+        if not self.check_crs(input_layer.crs(), extent_layer.crs(), feedback):
+            return {}
+        extent_rectangle = extent_layer.extent()
+        if extent_rectangle.isNull():
+            msg = self.tr('The extent layer has not a valid extent.')
+            feedback.reportError(
+                msg,
+                fatalError=True
+            )
+        input_fields = input_layer.fields()
+        input_type = input_layer.wkbType()
+        (sink, dest_id) = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            input_fields,
+            input_type,
+            QgsCoordinateReferenceSystem("EPSG:3857")
+        )
+        if sink is None:
+            raise QgsProcessingException(
+                self.invalidSinkError(parameters, self.OUTPUT)
+            )
+        # Qtransform translates the scaled coordinates
+        transformer = scale.scale_transform(
+            extent_rectangle.center(),
+            scale_number
+        )
+        # Return the cached result if the input and parameters are the same
+        result_cache = None
+        cache_writer = None
+        if use_cache:
+            result_cache = cache.ResultCache()
+            cache_key = cache.layer_key(
+                input_layer,
+                self.name(),
+                scale_number,
+                extent_rectangle.center().x(),
+                extent_rectangle.center().y()
+            )
+            cached_layer = result_cache.get(cache_key)
+            if cached_layer is not None:
+                feedback.pushInfo(
+                    self.tr('Result cache hit, layer read from the cache.')
+                )
+                for feature in cache.cached_features(
+                    cached_layer,
+                    input_fields
+                ):
+                    if feedback.isCanceled():
+                        return {}
+                    sink.addFeature(feature, QgsFeatureSink.FastInsert)
+                return {self.OUTPUT: dest_id}
+            feedback.pushInfo(
+                self.tr('Result cache miss, layer scaled and cached.')
+            )
+            cache_writer = result_cache.writer(
+                cache_key,
+                input_fields,
+                input_type,
+                QgsCoordinateReferenceSystem("EPSG:3857"),
+                context.transformContext()
+            )
+        # Transform the geometries by batches and add them to the sink
+        partial_progress = 100
+        if input_layer.featureCount() > 0:
+            partial_progress = 100 / input_layer.featureCount()
+        batch = []
+        for enum, feature in enumerate(input_layer.getFeatures(), 1):
+            batch.append(feature)
+            if len(batch) < scale.BATCH_SIZE:
+                continue
+            if feedback.isCanceled():
+                break
+            self.add_scaled(batch, transformer, sink, cache_writer)
+            batch = []
+            feedback.setProgress(int(enum * partial_progress))
+        if batch and not feedback.isCanceled():
+            self.add_scaled(batch, transformer, sink, cache_writer)
+        if cache_writer is not None:
+            del cache_writer
+            if feedback.isCanceled():
+                result_cache.discard(cache_key)
+            else:
+                result_cache.commit(cache_key)
+        if feedback.isCanceled():
+            return {}
+        return {self.OUTPUT: dest_id}
+
+    def add_scaled(self, batch, transformer, sink, cache_writer=None):
+        """Scale a batch of features and add them to the sink.
+
+        The scaled features are also added to the result cache writer, if
+            there is one.
+        """
+        scaled = scale.scale_features(batch, transformer)
+        sink.addFeatures(scaled, QgsFeatureSink.FastInsert)
+        if cache_writer is not None:
+            cache_writer.addFeatures(scaled, QgsFeatureSink.FastInsert)
+
+    def check_crs(self, input_crs, extent_crs, feedback):
+        """Check that the input and extent CRS are valid and the same.
+
+        Report the first error found to the feedback, and return False if
+            there is one, True otherwise.
+        """
         input_authid = input_crs.authid()
-        extent_crs = extent_layer.crs()
         extent_authid = extent_crs.authid()
         if not input_crs.isValid():
             msg = self.tr(
@@ -172,7 +301,7 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
                 msg,
                 fatalError=True
             )
-            return {}
+            return False
         if not extent_crs.isValid():
             msg = self.tr(
                 'The CRS of the extent layer could not be \
@@ -182,7 +311,7 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
                 msg,
                 fatalError=True
             )
-            return {}
+            return False
         if input_crs.isGeographic():
             msg = self.tr(
                 'The CRS of the input layer must be \
@@ -192,7 +321,7 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
                 msg.format(input_authid=input_authid),
                 fatalError=True
             )
-            return {}
+            return False
         if extent_crs.isGeographic():
             msg = self.tr(
                 'The CRS of the extent layer must be \
@@ -202,7 +331,7 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
                 msg.format(extent_authid=extent_authid),
                 fatalError=True
             )
-            return {}
+            return False
         if input_authid != extent_authid:
             msg = self.tr(
                 'The CRS of the input layer ({input_authid}) \
@@ -216,49 +345,5 @@ class ScaleVectorLayer(QgsProcessingAlgorithm):
                 ),
                 fatalError=True
             )
-            return {}
-        extent_rectangle = extent_layer.extent()
-        if extent_rectangle.isNull():
-            msg = self.tr('The extent layer has not a valid extent.')
-            feedback.reportError(
-                msg,
-                fatalError=True
-            )
-        input_fields = input_layer.fields()
-        input_type = input_layer.wkbType()
-        (sink, dest_id) = self.parameterAsSink(
-            parameters,
-            self.OUTPUT,
-            context,
-            input_fields,
-            input_type,
-            QgsCoordinateReferenceSystem("EPSG:3857")
-        )
-        if sink is None:
-            raise QgsProcessingException(
-                self.invalidSinkError(parameters, self.OUTPUT)
-            )
-        # Qtransform translates the scaled coordinates
-        # 10000 is the tenths of milimeter to meters factor
-        scale_factor = 10000/scale_number
-        m11 = scale_factor
-        m12 = 0.0
-        m21 = 0.0
-        m22 = scale_factor
-        dx = -extent_rectangle.center().x() * scale_factor  # *
-        dy = -extent_rectangle.center().y() * scale_factor  # *
-        transformer = QTransform(m11, m12, m21, m22, dx, dy)
-        # Transform each geometry and add feature to the sink
-        partial_progress = 100
-        if input_layer.featureCount() > 0:
-            partial_progress = 100 / input_layer.featureCount()
-        features = input_layer.getFeatures()
-        for enum, feature in enumerate(features, 1):
-            if feedback.isCanceled():
-                return {}
-            geom = feature.geometry()
-            geom.transform(transformer)
-            feature.setGeometry(geom)
-            sink.addFeature(feature, QgsFeatureSink.FastInsert)
-            feedback.setProgress(int(enum * partial_progress))
-        return {self.OUTPUT: dest_id}
+            return False
+        return True
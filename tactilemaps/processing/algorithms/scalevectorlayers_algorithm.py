@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""Scale several vector layers to the size of the map.
+
+************************************************************************
+    Name                : scalevectorlayers_algorithm.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransformContext,
+    QgsFeatureSink,
+    QgsFields,
+    QgsProcessing,
+    QgsProcessingContext,
+    QgsProcessingException,
+    QgsProcessingOutputMultipleLayers,
+    QgsProcessingParameterDefinition,
+    QgsProcessingParameterFolderDestination,
+    QgsProcessingParameterMultipleLayers,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterVectorLayer,
+    QgsVectorFileWriter,
+    QgsVectorLayerFeatureSource
+)
+from qgis.PyQt.QtCore import QSettings
+
+from tactilemaps.processing.algorithms.scalevectorlayer_algorithm import (
+    ScaleVectorLayer
+)
+from tactilemaps.utils import scale
+
+
+class ScaleVectorLayers(ScaleVectorLayer):
+    """Scale vector layers algorithm class."""
+
+    INPUT_LAYERS = 'INPUT_LAYERS'
+    THREADS = 'THREADS'
+    OUTPUT_FOLDER = 'OUTPUT_FOLDER'
+    OUTPUT_LAYERS = 'OUTPUT_LAYERS'
+
+    def createInstance(self):
+        """Return a new instance of the algorithm."""
+        return ScaleVectorLayers()
+
+    def name(self):
+        """Return the algorithm name."""
+        return 'scalevectorlayers'
+
+    def displayName(self):
+        """Return the algorithm display name."""
+        return self.tr('Scale vector layers')
+
+    def shortHelpString(self):
+        """Return the display help of the algortihm."""
+        return self.tr(
+            """
+            Scale several vector layers, from an extent layer, by a \
+                scale denominator number, as Scale vector layer does \
+                with a single layer.
+            The CRS of every layer is checked once against the extent \
+                layer, and all layers are scaled with the same transform, \
+                concurrently by several threads.
+            Each scaled layer is written as a GeoPackage, named after the \
+                input layer, in the output folder, and loaded when the \
+                algorithm finishes.
+            EPSG:3857 CRS will be assigned to the \
+                output layers, without reprojecting them.
+            """
+        )
+
+    def shortDescription(self):
+        """Return the display description of the algorithm."""
+        return self.tr('Scale several vector layers.')
+
+    def initAlgorithm(self, config=None):
+        """Define inputs and outputs of the algorithm."""
+        # PARAMETERS
+        self.addParameter(
+            QgsProcessingParameterMultipleLayers(
+                self.INPUT_LAYERS,
+                self.tr('Input vector layers'),
+                layerType=Qgis.ProcessingSourceType.VectorAnyGeometry
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterVectorLayer(
+                self.EXTENT,
+                self.tr('Extent layer'),
+                types=[QgsProcessing.TypeVectorPolygon],
+                defaultValue=None
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.SCALE,
+                self.tr('Scale denominator number'),
+                QgsProcessingParameterNumber.Integer,
+                minValue=1,
+                defaultValue=QSettings().value(
+                    'tactilemaps/scalevectorlayer/scale',
+                    1
+                )
+            )
+        )
+        threads_param = QgsProcessingParameterNumber(
+            self.THREADS,
+            self.tr('Number of threads'),
+            QgsProcessingParameterNumber.Integer,
+            minValue=1,
+            defaultValue=self.rw_settings('r', 'threads', 1)
+        )
+        threads_param.setFlags(
+            threads_param.flags()
+            | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(threads_param)
+        # OUTPUTS
+        self.addParameter(
+            QgsProcessingParameterFolderDestination(
+                self.OUTPUT_FOLDER,
+                self.tr('Scaled layers folder')
+            )
+        )
+        self.addOutput(
+            QgsProcessingOutputMultipleLayers(
+                self.OUTPUT_LAYERS,
+                self.tr('Scaled layers')
+            )
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """Scale Vector Layers process.
+
+        Return the folder and the list of files of the input vector
+            layers scaled, from the extent layer, by a scale denominator
+            number, centered in the origin of coordinates of EPSG:3857.
+        """
+        # Get parameters and write settings
+        input_layers = self.parameterAsLayerList(
+            parameters,
+            self.INPUT_LAYERS,
+            context
+        )
+        extent_layer = self.parameterAsVectorLayer(
+            parameters,
+            self.EXTENT,
+            context
+        )
+        scale_number = self.parameterAsInt(
+            parameters,
+            self.SCALE,
+            context
+        )
+        QSettings().setValue(
+            'tactilemaps/scalevectorlayer/scale',
+            scale_number
+        )
+        threads = self.parameterAsInt(
+            parameters,
+            self.THREADS,
+            context
+        )
+        self.rw_settings('w', 'threads', threads)
+        folder = self.parameterAsString(
+            parameters,
+            self.OUTPUT_FOLDER,
+            context
+        )
+        os.makedirs(folder, exist_ok=True)
+        # Perform checks once, the CRS of every layer must be the same
+        for input_layer in input_layers:
+            if not self.check_crs(
+                input_layer.crs(),
+                extent_layer.crs(),
+                feedback
+            ):
+                return {}
+        extent_rectangle = extent_layer.extent()
+        if extent_rectangle.isNull():
+            msg = self.tr('The extent layer has not a valid extent.')
+            feedback.reportError(
+                msg,
+                fatalError=True
+            )
+            return {}
+        transformer = scale.scale_transform(
+            extent_rectangle.center(),
+            scale_number
+        )
+        # Prepare the sources in this thread, and a file for each layer
+        jobs = []
+        names = set()
+        for input_layer in input_layers:
+            name = re.sub(r'[^\w-]+', '_', input_layer.name()) or 'layer'
+            unique_name = name
+            suffix = 1
+            while unique_name.lower() in names:
+                suffix += 1
+                unique_name = f'{name}_{suffix}'
+            names.add(unique_name.lower())
+            jobs.append((
+                input_layer,
+                QgsVectorLayerFeatureSource(input_layer),
+                QgsFields(input_layer.fields()),
+                input_layer.wkbType(),
+                os.path.join(folder, f'{unique_name}.gpkg')
+            ))
+        # Scale the layers concurrently, with a combined progress
+        total = sum(max(job[0].featureCount(), 0) for job in jobs)
+        transform_context = QgsCoordinateTransformContext(
+            context.transformContext()
+        )
+        done = [0]
+        lock = threading.Lock()
+
+        def advance(count):
+            with lock:
+                done[0] += count
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(
+                    self.scale_layer,
+                    source,
+                    fields,
+                    wkb_type,
+                    path,
+                    transformer,
+                    transform_context,
+                    advance,
+                    feedback
+                )
+                for _, source, fields, wkb_type, path in jobs
+            ]
+            pending = futures
+            while pending:
+                finished, pending = wait(
+                    pending,
+                    timeout=0.1,
+                    return_when=FIRST_EXCEPTION
+                )
+                for future in finished:
+                    future.result()
+                if total:
+                    feedback.setProgress(int(100 * done[0] / total))
+        if feedback.isCanceled():
+            return {}
+
+        output_layers = []
+        for layer, _, _, _, path in jobs:
+            details = QgsProcessingContext.LayerDetails(
+                layer.name(),
+                context.project(),
+                self.OUTPUT_LAYERS
+            )
+            context.addLayerToLoadOnCompletion(path, details)
+            output_layers.append(path)
+            feedback.pushInfo(f"Layer '{layer.name()}' scaled to {path}.")
+        return {self.OUTPUT_FOLDER: folder, self.OUTPUT_LAYERS: output_layers}
+
+    def scale_layer(self, source, fields, wkb_type, path, transformer,
+                    transform_context, advance, feedback):
+        """Scale the features of a source into a GeoPackage file.
+
+        Runs in a worker thread, so it only gets a feature source and
+            copies of the fields, the geometry type and the transform
+            context, read from the layer and the context in the main
+            thread.
+        'advance' is called with the count of features of each batch
+            written, to keep the combined progress.
+        """
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = 'GPKG'
+        options.layerName = os.path.splitext(os.path.basename(path))[0]
+        writer = QgsVectorFileWriter.create(
+            path,
+            fields,
+            wkb_type,
+            QgsCoordinateReferenceSystem('EPSG:3857'),
+            transform_context,
+            options
+        )
+        if writer.hasError() != QgsVectorFileWriter.NoError:
+            raise QgsProcessingException(writer.errorMessage())
+        batch = []
+        for feature in source.getFeatures():
+            batch.append(feature)
+            if len(batch) < scale.BATCH_SIZE:
+                continue
+            if feedback.isCanceled():
+                break
+            writer.addFeatures(
+                scale.scale_features(batch, transformer),
+                QgsFeatureSink.FastInsert
+            )
+            advance(len(batch))
+            batch = []
+        if batch and not feedback.isCanceled():
+            writer.addFeatures(
+                scale.scale_features(batch, transformer),
+                QgsFeatureSink.FastInsert
+            )
+            advance(len(batch))
+        del writer
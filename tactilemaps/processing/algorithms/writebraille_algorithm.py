@@ -25,6 +25,8 @@ from qgis.core import (
     QgsProcessing,
     QgsProcessingAlgorithm,
     QgsProcessingException,
+    QgsProcessingParameterDefinition,
+    QgsProcessingParameterEnum,
     QgsProcessingParameterFeatureSink,
     QgsProcessingParameterString,
 )
@@ -41,6 +43,7 @@ class WriteBraille(QgsProcessingAlgorithm):
     """Write Braille algorithm class."""
 
     TEXT = 'TEXT'
+    DOTS = 'DOTS'
     OUTPUT = 'OUTPUT'
 
     def tr(self, string):
@@ -96,6 +99,8 @@ class WriteBraille(QgsProcessingAlgorithm):
                 and the cells containing those characters are left empty.
             An "h" attribute is filled with the standard height to be \
                 rasterized.
+            Dots are stamped from a single dot polygon by default; \
+                buffering the dot points gives the same shapes, slower.
             """
         )
 
@@ -114,6 +119,20 @@ class WriteBraille(QgsProcessingAlgorithm):
         )
         self.addParameter(text_param)
 
+        dots_param = QgsProcessingParameterEnum(
+            name=self.DOTS,
+            description=self.tr('Dots geometry'),
+            options=[
+                self.tr('Stamp a dot template'),
+                self.tr('Buffer the dot points')
+            ],
+            defaultValue=int(self.rw_settings('r', 'dots', 0))
+        )
+        dots_param.setFlags(
+            dots_param.flags() | QgsProcessingParameterDefinition.FlagAdvanced
+        )
+        self.addParameter(dots_param)
+
         # OUTPUT
         braille_output = QgsProcessingParameterFeatureSink(
             name=self.OUTPUT,
@@ -137,9 +156,15 @@ class WriteBraille(QgsProcessingAlgorithm):
             context=context
         )
         self.rw_settings('w', 'text', input_text)
+        dots_method = self.parameterAsEnum(
+            parameters=parameters,
+            name=self.DOTS,
+            context=context
+        )
+        self.rw_settings('w', 'dots', dots_method)
 
-        # Get Braille multipoint geometry
-        multipoint, errors = braille.translate(input_text)
+        # Get Braille dots coordinates
+        coords, errors = braille.layout(input_text)
         if errors:
             msg = f"One or more not implemented characters:{errors}."
             feedback.pushWarning(msg)
@@ -153,10 +178,15 @@ class WriteBraille(QgsProcessingAlgorithm):
         ]
         fields.append(fields_list)
 
-        geom = QgsGeometry(multipoint).buffer(
-            distance=braille.DIM["e"] / 2,
-            segments=5
-        )
+        if dots_method == 0:
+            geom = braille.stamp_dots(coords)
+        else:
+            multipoint = QgsGeometry()
+            multipoint.fromWkb(braille.multipoint_wkb(coords))
+            geom = multipoint.buffer(
+                distance=braille.DIM["e"] / 2,
+                segments=5
+            )
         geometryType = Qgis.WkbType.MultiPolygon
         crs = QgsCoordinateReferenceSystem("EPSG:3857")
 
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""Write Braille labels for the features of a layer.
+
+************************************************************************
+    Name                : writebraillelayer_algorithm.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+from qgis.core import (
+    NULL,
+    Qgis,
+    QgsExpression,
+    QgsFeature,
+    QgsFeatureSink,
+    QgsField,
+    QgsFields,
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingException,
+    QgsProcessingParameterExpression,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsWkbTypes
+)
+from qgis.PyQt.QtCore import (
+    QCoreApplication,
+    QMetaType,
+    QSettings
+)
+
+from tactilemaps.utils import braille
+
+
+class WriteBrailleFromLayer(QgsProcessingAlgorithm):
+    """Write Braille from layer algorithm class."""
+
+    INPUT = 'INPUT'
+    EXPRESSION = 'EXPRESSION'
+    OUTPUT = 'OUTPUT'
+
+    def tr(self, string):
+        """Return a localized string."""
+        return QCoreApplication.translate('WriteBrailleFromLayer', string)
+
+    def rw_settings(self, mode, setting_name, value):
+        """Read and write tactilemaps settings.
+
+        If 'mode' is 'r', read the value of 'setting_name',
+            or a default 'value'.
+        If 'mode' is 'w', write the 'value' in the 'setting_name'.
+        """
+        directory = ['tactilemaps', self.name(), setting_name]
+        setting_path = '/'.join(directory)
+        if mode == 'w':
+            return QSettings().setValue(setting_path, value)
+        elif mode == 'r':
+            return QSettings().value(setting_path, value)
+        else:
+            raise ValueError("Invalid mode. Expected one of 'w' or 'r'.")
+
+    def createInstance(self):
+        """Return a new instance of the algorithm."""
+        return WriteBrailleFromLayer()
+
+    def name(self):
+        """Return the algorithm name."""
+        return 'writebraillefromlayer'
+
+    def displayName(self):
+        """Return the algorithm display name."""
+        return self.tr('Write Braille from layer')
+
+    def group(self):
+        """Return the name of the group this algorithm belongs to."""
+        return ''
+
+    def groupId(self):
+        """Return the unique ID of the group this algorithm belongs to."""
+        return ''
+
+    def shortHelpString(self):
+        """Return the display help of the algortihm."""
+        return self.tr(
+            """
+            Write a Braille label for each feature of a layer.
+            The text of each label is the value of an expression, and it \
+                is written with its origin point at the anchor of the \
+                feature: the point itself for point layers, or a point \
+                on the surface of the geometry otherwise.
+            The input layer is expected to be scaled to the map size, \
+                using tenths of milimeters as units of standard dimensions.
+            The output will have a feature with a multipolygon geometry \
+                for each input feature with a non empty text.
+            If the texts contain unimplemented characters, a warning is \
+                issued and the cells containing those characters are left \
+                empty.
+            An "h" attribute is filled with the standard height to be \
+                rasterized.
+            """
+        )
+
+    def shortDescription(self):
+        """Return the display description of the algorithm."""
+        return self.tr('Write Braille labels for the features of a layer.')
+
+    def initAlgorithm(self, config=None):
+        """Define the inputs and outputs of the algorithm."""
+        # PARAMETERS
+        input_param = QgsProcessingParameterFeatureSource(
+            name=self.INPUT,
+            description=self.tr('Input layer'),
+            types=[QgsProcessing.TypeVectorAnyGeometry]
+        )
+        self.addParameter(input_param)
+
+        expression_param = QgsProcessingParameterExpression(
+            name=self.EXPRESSION,
+            description=self.tr('Text expression'),
+            defaultValue=self.rw_settings('r', 'expression', ""),
+            parentLayerParameterName=self.INPUT
+        )
+        self.addParameter(expression_param)
+
+        # OUTPUT
+        braille_output = QgsProcessingParameterFeatureSink(
+            name=self.OUTPUT,
+            description=self.tr('Braille'),
+            type=QgsProcessing.TypeVectorPolygon,
+            defaultValue=QgsProcessing.TEMPORARY_OUTPUT
+        )
+        self.addParameter(braille_output)
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """Write Braille from layer process.
+
+        Return a vector layer with a feature for each input feature, with
+            the text of the expression, in Braille, as a MultiPolygon
+            geometry anchored at the input geometry.
+        """
+        # Get parameters and write settings
+        source = self.parameterAsSource(
+            parameters=parameters,
+            name=self.INPUT,
+            context=context
+        )
+        if source is None:
+            raise QgsProcessingException(
+                self.invalidSourceError(parameters, self.INPUT)
+            )
+        expression_string = self.parameterAsExpression(
+            parameters=parameters,
+            name=self.EXPRESSION,
+            context=context
+        )
+        self.rw_settings('w', 'expression', expression_string)
+
+        expression = QgsExpression(expression_string)
+        if expression.hasParserError():
+            raise QgsProcessingException(expression.parserErrorString())
+        expression_context = self.createExpressionContext(
+            parameters,
+            context,
+            source
+        )
+        expression.prepare(expression_context)
+
+        # OUTPUT
+        fields = QgsFields()
+        fields_list = [
+            QgsField("id", QMetaType.Type.Int),
+            QgsField("text", QMetaType.Type.QString),
+            QgsField("h", QMetaType.Type.Int)
+        ]
+        fields.append(fields_list)
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters=parameters,
+            name=self.OUTPUT,
+            context=context,
+            fields=fields,
+            geometryType=Qgis.WkbType.MultiPolygon,
+            crs=source.sourceCrs()
+        )
+
+        if sink is None:
+            raise QgsProcessingException(
+                self.invalidSinkError(parameters, self.OUTPUT)
+            )
+
+        is_point = source.wkbType() != QgsWkbTypes.Unknown and (
+            QgsWkbTypes.geometryType(source.wkbType())
+            == QgsWkbTypes.PointGeometry
+        )
+        total = 100.0 / source.featureCount() if source.featureCount() else 0
+        errors = set()
+        skipped = 0
+        for current, feat in enumerate(source.getFeatures()):
+            if feedback.isCanceled():
+                return {}
+            feedback.setProgress(int(current * total))
+
+            expression_context.setFeature(feat)
+            text = expression.evaluate(expression_context)
+            if expression.hasEvalError():
+                raise QgsProcessingException(expression.evalErrorString())
+            geom = feat.geometry()
+            if text is None or text == NULL or str(text) == "" \
+                    or geom.isNull():
+                skipped += 1
+                continue
+            text = str(text)
+
+            if is_point and not geom.isMultipart():
+                anchor = geom.asPoint()
+            else:
+                anchor = geom.pointOnSurface().asPoint()
+
+            coords, char_errors = braille.layout(
+                text,
+                anchor.x(),
+                anchor.y()
+            )
+            errors.update(char_errors)
+
+            out_feat = QgsFeature(fields)
+            out_feat["id"] = feat.id()
+            out_feat["text"] = text
+            out_feat["h"] = braille.DIM["f"]
+            out_feat.setGeometry(braille.stamp_dots(coords))
+            sink.addFeature(out_feat, QgsFeatureSink.Flag.FastInsert)
+
+        if errors:
+            msg = f"One or more not implemented characters:{sorted(errors)}."
+            feedback.pushWarning(msg)
+        if skipped:
+            feedback.pushInfo(
+                f"{skipped} features without text or geometry were skipped."
+            )
+
+        return {self.OUTPUT: dest_id}
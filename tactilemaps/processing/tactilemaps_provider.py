@@ -22,10 +22,16 @@ from qgis.core import QgsProcessingProvider
 
 from tactilemaps.processing.algorithms import (
     computescale_algorithm,
+    exportmesh_algorithm,
     extractedges_algorithm,
+    produceatlas_algorithm,
+    producesheet_algorithm,
     rasterize_algorithm,
+    rasterizeedges_algorithm,
     scalevectorlayer_algorithm,
-    writebraille_algorithm
+    scalevectorlayers_algorithm,
+    writebraille_algorithm,
+    writebraillelayer_algorithm
 )
 
 
@@ -39,10 +45,18 @@ class TactileMapsProvider(QgsProcessingProvider):
     def loadAlgorithms(self, *args, **kwargs):
         """Load the algorithms of the provider."""
         self.addAlgorithm(computescale_algorithm.ComputeScale())
+        self.addAlgorithm(exportmesh_algorithm.ExportMesh())
         self.addAlgorithm(extractedges_algorithm.ExtractEdges())
+        self.addAlgorithm(produceatlas_algorithm.ProduceTactileAtlas())
+        self.addAlgorithm(producesheet_algorithm.ProduceTactileSheet())
         self.addAlgorithm(rasterize_algorithm.RasterizeMap())
+        self.addAlgorithm(rasterizeedges_algorithm.RasterizeEdges())
         self.addAlgorithm(scalevectorlayer_algorithm.ScaleVectorLayer())
+        self.addAlgorithm(scalevectorlayers_algorithm.ScaleVectorLayers())
         self.addAlgorithm(writebraille_algorithm.WriteBraille())
+        self.addAlgorithm(
+            writebraillelayer_algorithm.WriteBrailleFromLayer()
+        )
 
     def id(self, *args, **kwargs):
         """Return the id of the provider."""
@@ -70,6 +70,13 @@ class TactileMapsPlugin:
         self.computescale_action.triggered.connect(
             self.run_computescale
         )
+        self.exportmesh_action = QAction(
+            self.tr('Export tactile &mesh'),
+            self.iface.mainWindow()
+        )
+        self.exportmesh_action.triggered.connect(
+            self.run_exportmesh
+        )
         self.extractedges_action = QAction(
             self.tr('&Extract edges'),
             self.iface.mainWindow()
@@ -77,6 +84,20 @@ class TactileMapsPlugin:
         self.extractedges_action.triggered.connect(
             self.run_extractedges
         )
+        self.produceatlas_action = QAction(
+            self.tr('Produce tactile &atlas'),
+            self.iface.mainWindow()
+        )
+        self.produceatlas_action.triggered.connect(
+            self.run_produceatlas
+        )
+        self.producesheet_action = QAction(
+            self.tr('&Produce tactile sheet'),
+            self.iface.mainWindow()
+        )
+        self.producesheet_action.triggered.connect(
+            self.run_producesheet
+        )
         self.rasterizemap_action = QAction(
             self.tr('&Rasterize map'),
             self.iface.mainWindow()
@@ -84,6 +105,13 @@ class TactileMapsPlugin:
         self.rasterizemap_action.triggered.connect(
             self.run_rasterizemap
         )
+        self.rasterizeedges_action = QAction(
+            self.tr('Rasteri&ze edges'),
+            self.iface.mainWindow()
+        )
+        self.rasterizeedges_action.triggered.connect(
+            self.run_rasterizeedges
+        )
         self.writebraille_action = QAction(
             self.tr('&Write braille'),
             self.iface.mainWindow()
@@ -95,9 +123,23 @@ class TactileMapsPlugin:
         self.scalevectorlayer_action.triggered.connect(
             self.run_scalevectorlayer
         )
+        self.scalevectorlayers_action = QAction(
+            self.tr('Scale vector la&yers'),
+            self.iface.mainWindow()
+        )
+        self.scalevectorlayers_action.triggered.connect(
+            self.run_scalevectorlayers
+        )
         self.writebraille_action.triggered.connect(
             self.run_writebraille
         )
+        self.writebraillelayer_action = QAction(
+            self.tr('Write braille from &layer'),
+            self.iface.mainWindow()
+        )
+        self.writebraillelayer_action.triggered.connect(
+            self.run_writebraillelayer
+        )
         # Init menu
         self.menu = self.iface.pluginMenu().addMenu(
             icon,
@@ -105,10 +147,16 @@ class TactileMapsPlugin:
         )
         self.menu.addActions([
             self.computescale_action,
+            self.exportmesh_action,
             self.extractedges_action,
+            self.produceatlas_action,
+            self.producesheet_action,
             self.rasterizemap_action,
+            self.rasterizeedges_action,
             self.scalevectorlayer_action,
-            self.writebraille_action
+            self.scalevectorlayers_action,
+            self.writebraille_action,
+            self.writebraillelayer_action
         ])
 
         # Init Processing
@@ -123,18 +171,42 @@ class TactileMapsPlugin:
         """Open the Compute scale algorithm dialog."""
         processing.execAlgorithmDialog('tactilemaps:computescale')
 
+    def run_exportmesh(self):
+        """Open the Export tactile mesh algorithm dialog."""
+        processing.execAlgorithmDialog('tactilemaps:exportmesh')
+
     def run_extractedges(self):
         """Open the Extract edges algorithm dialog."""
         processing.execAlgorithmDialog('tactilemaps:extractedges')
 
+    def run_produceatlas(self):
+        """Open the Produce tactile atlas algorithm dialog."""
+        processing.execAlgorithmDialog('tactilemaps:producetactileatlas')
+
+    def run_producesheet(self):
+        """Open the Produce tactile sheet algorithm dialog."""
+        processing.execAlgorithmDialog('tactilemaps:producetactilesheet')
+
     def run_rasterizemap(self):
         """Open the Rasterize map algorithm dialog."""
         processing.execAlgorithmDialog('tactilemaps:rasterizemap')
 
+    def run_rasterizeedges(self):
+        """Open the Rasterize edges algorithm dialog."""
+        processing.execAlgorithmDialog('tactilemaps:rasterizeedges')
+
     def run_scalevectorlayer(self):
         """Open the Scale vector layer algorithm dialog."""
         processing.execAlgorithmDialog('tactilemaps:scalevectorlayer')
 
+    def run_scalevectorlayers(self):
+        """Open the Scale vector layers algorithm dialog."""
+        processing.execAlgorithmDialog('tactilemaps:scalevectorlayers')
+
     def run_writebraille(self):
         """Open the Write braille algorithm dialog."""
         processing.execAlgorithmDialog('tactilemaps:writebraille')
+
+    def run_writebraillelayer(self):
+        """Open the Write braille from layer algorithm dialog."""
+        processing.execAlgorithmDialog('tactilemaps:writebraillefromlayer')
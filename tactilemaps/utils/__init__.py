@@ -7,6 +7,22 @@ requires it.
 Modules:
 - tactilemaps.utils.braille: Utilities to facilitate the conversion of texts
 to Braille and the creation of geometries that represent them..
+- tactilemaps.utils.cache: On-disk cache of algorithm results, keyed by the
+content of the input layers and the parameters.
+- tactilemaps.utils.distance: Bounded Euclidean distance transform of raster
+masks, to rasterize bands around lines.
+- tactilemaps.utils.edges: Geometry operations to extract the edges of
+polygons in memory.
+- tactilemaps.utils.mesh: Build solid triangle meshes from height maps and
+write them as STL or 3MF files.
+- tactilemaps.utils.rasterize: Utilities to burn vector layers into GDAL
+raster datasets.
+- tactilemaps.utils.scale: Compute map scales and scale geometries to the
+map size.
+- tactilemaps.utils.smoothing: Vectorized separable convolution used to
+smooth the rasterized maps.
+- tactilemaps.utils.wkb: Bulk affine transform of the coordinates of WKB
+geometries.
 
 ************************************************************************
     Name                : __init__.py
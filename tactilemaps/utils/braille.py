@@ -14,9 +14,13 @@
 ************************************************************************
 """
 
+from functools import lru_cache
+
+import numpy as np
 from qgis.core import (
-    QgsMultiPoint,
+    QgsGeometry,
     QgsPoint,
+    QgsPointXY,
 )
 
 ALPHABET = {
@@ -166,35 +170,143 @@ def create_points(char_arr, x_off=0, y_off=0):
 
     return points
 
-def translate(text):
-    """Translate a text to braille points.
+# Offsets (x, y) of the six dot positions of a cell, in the order of
+# create_points: the bit k of a glyph mask is set if dot offset k is raised.
+DOTS = np.array(
+    [(j * DIM["a"], (2 - i) * DIM["b"]) for i in range(3) for j in range(2)],
+    dtype=np.float64
+)
 
-    Return a tuple of a MultiPoint geometry (or None) and a
-    (possibly empty) list of not implemented characters.
+@lru_cache(maxsize=None)
+def glyph(char):
+    """Return the cell masks of a character, or None if not implemented.
+
+    The glyph is a tuple with a 6 bit mask for each cell, where bit k
+        is set if the dot at DOTS[k] is raised.
+    Glyphs are computed once per character and memoized.
     """
-    all_points = []
+    char_cells = convert_char(char)
+    if not char_cells:
+        return None
+    return tuple(
+        sum(
+            1 << (i * 2 + j)
+            for i, row in enumerate(char_arr)
+            for j, val in enumerate(row)
+            if val
+        )
+        for char_arr in char_cells
+    )
+
+def layout(text, x_off=0, y_off=0):
+    """Lay out the Braille dots of a text.
+
+    Return a tuple of a (N, 2) array with the coordinates of the dots,
+    in the order of translate, and a (possibly empty) list of not
+    implemented characters.
+    """
+    masks = []
+    cells = []
     errors = []
 
-    # Process each line
+    # Look up the cells of each line
     for row_idx, line in enumerate(text.splitlines()):
-        y_off = - row_idx * DIM["d"]
 
         # Track cell index for multicell characters
         cell_idx = 0
         for char in line:
-            char_cells = convert_char(char)
-            if not char_cells:
+            char_glyph = glyph(char)
+            if char_glyph is None:
                 errors.append(char)
                 continue
 
-            for _cell in char_cells:
-                x_off = cell_idx * DIM["c"]
-                points = create_points(_cell, x_off, y_off)
-                all_points.extend(points)
+            for mask in char_glyph:
+                masks.append(mask)
+                cells.append((cell_idx, row_idx))
                 cell_idx += 1
 
+    # Place the raised dots of all cells at once
+    masks = np.array(masks, dtype=np.uint8)
+    cells = np.array(cells, dtype=np.float64).reshape(-1, 2)
+    origins = cells * (DIM["c"], -DIM["d"]) + (x_off, y_off)
+    raised = ((masks[:, None] >> np.arange(6)) & 1).astype(bool)
+    coords = (origins[:, None, :] + DOTS[None, :, :])[raised]
+
+    return coords, errors
+
+def multipoint_wkb(coords):
+    """Return the WKB of a MultiPoint from a (N, 2) array of coordinates."""
+    points = np.zeros(
+        len(coords),
+        dtype=np.dtype([
+            ("order", "u1"),
+            ("type", "<u4"),
+            ("xy", "<f8", 2)
+        ])
+    )
+    points["order"] = 1
+    points["type"] = 1  # Point
+    points["xy"] = coords
+    header = np.array([1], dtype="u1").tobytes()
+    header += np.array([4, len(coords)], dtype="<u4").tobytes()  # MultiPoint
+    return header + points.tobytes()
+
+@lru_cache(maxsize=None)
+def dot_ring(segments=5):
+    """Return the (K, 2) exterior ring of a dot centered at the origin.
+
+    The ring is the buffer of a point by half the dot diameter, built
+        once per count of segments and shared, so it must not be modified.
+    """
+    dot = QgsGeometry.fromPointXY(QgsPointXY(0, 0)).buffer(
+        DIM["e"] / 2,
+        segments
+    )
+    return np.array([(p.x(), p.y()) for p in dot.asPolygon()[0]])
+
+def multipolygon_wkb(coords, ring):
+    """Return the WKB of a MultiPolygon with a copy of 'ring' per point."""
+    polygons = np.zeros(
+        len(coords),
+        dtype=np.dtype([
+            ("order", "u1"),
+            ("type", "<u4"),
+            ("rings", "<u4"),
+            ("points", "<u4"),
+            ("xy", "<f8", ring.shape)
+        ])
+    )
+    polygons["order"] = 1
+    polygons["type"] = 3  # Polygon
+    polygons["rings"] = 1
+    polygons["points"] = len(ring)
+    polygons["xy"] = coords[:, None, :] + ring[None, :, :]
+    header = np.array([1], dtype="u1").tobytes()
+    header += np.array([6, len(coords)], dtype="<u4").tobytes()  # MultiPolygon
+    return header + polygons.tobytes()
+
+def stamp_dots(coords, segments=5):
+    """Return a MultiPolygon geometry with a dot for each point.
+
+    Dots do not overlap at standard dimensions, so a dot template is
+        translated to each point instead of buffering and dissolving them.
+    """
+    geom = QgsGeometry()
+    geom.fromWkb(multipolygon_wkb(coords, dot_ring(segments)))
+    return geom
+
+def translate(text):
+    """Translate a text to braille points.
+
+    Return a tuple of a MultiPoint geometry (or None) and a
+    (possibly empty) list of not implemented characters.
+    """
+    coords, errors = layout(text)
+
     multipoints = None
-    if all_points:
-        multipoints = QgsMultiPoint(all_points)
+    if len(coords):
+        geom = QgsGeometry()
+        geom.fromWkb(multipoint_wkb(coords))
+        multipoints = geom.constGet().clone()
 
     return multipoints, errors
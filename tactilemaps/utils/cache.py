@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache of algorithm results keyed by the content of the inputs.
+
+************************************************************************
+    Name                : cache.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import glob
+import hashlib
+import os
+import struct
+
+from qgis.core import (
+    QgsApplication,
+    QgsFeature,
+    QgsFeatureRequest,
+    QgsVectorFileWriter,
+    QgsVectorLayer
+)
+
+# Version of the cached results, to change when the algorithms do.
+CACHE_VERSION = 1
+
+# Total size of the cached results before evicting the oldest (bytes).
+MAX_SIZE = 512 * 2**20
+
+# Name of the layer of the GeoPackage of each cached result.
+LAYER_NAME = 'result'
+
+INT64 = struct.Struct('<q')
+
+
+def layer_key(layer, *values):
+    """Return the SHA-256 hex digest of a layer content and other values.
+
+    The digest covers the CRS, the fields and, for every feature, its id,
+        its attributes and the WKB of its geometry, besides the 'values',
+        as the algorithm name and its parameters.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((CACHE_VERSION,) + values).encode())
+    digest.update(layer.crs().toWkt().encode())
+    for field in layer.fields():
+        digest.update(f'{field.name()}:{field.typeName()};'.encode())
+    for feat in layer.getFeatures(QgsFeatureRequest()):
+        digest.update(INT64.pack(feat.id()))
+        digest.update(repr(feat.attributes()).encode())
+        if feat.hasGeometry():
+            digest.update(bytes(feat.geometry().asWkb()))
+    return digest.hexdigest()
+
+
+def cached_features(layer, fields):
+    """Yield the features of a cached result layer with the given fields.
+
+    GeoPackage layers expose their primary key as a 'fid' field, so the
+        attributes are matched by field name.
+    """
+    indexes = [layer.fields().indexFromName(name) for name in fields.names()]
+    for feat in layer.getFeatures():
+        attrs = feat.attributes()
+        cached = QgsFeature(fields)
+        cached.setGeometry(feat.geometry())
+        cached.setAttributes([
+            attrs[index] if index >= 0 else None for index in indexes
+        ])
+        yield cached
+
+
+class ResultCache:
+    """Cache of results as GeoPackage files, evicted by least recent use.
+
+    Every result is written to a partial file and renamed when complete,
+        so a canceled run never leaves a result behind. Reading a result
+        updates its modification time, which orders the eviction.
+    """
+
+    def __init__(self, folder=None, max_size=MAX_SIZE):
+        """Use 'folder', or the cache folder of the QGIS profile."""
+        if folder is None:
+            folder = os.path.join(
+                QgsApplication.qgisSettingsDirPath(),
+                'tactilemaps',
+                'cache'
+            )
+        self.folder = folder
+        self.max_size = max_size
+        os.makedirs(self.folder, exist_ok=True)
+
+    def path(self, key, partial=False):
+        """Return the path of the file of a result."""
+        suffix = '.part.gpkg' if partial else '.gpkg'
+        return os.path.join(self.folder, key + suffix)
+
+    def get(self, key):
+        """Return the layer of a cached result, or None if there is not."""
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        layer = QgsVectorLayer(
+            f'{path}|layername={LAYER_NAME}',
+            key,
+            'ogr'
+        )
+        if not layer.isValid():
+            return None
+        os.utime(path)
+        return layer
+
+    def writer(self, key, fields, wkb_type, crs, transform_context):
+        """Return a writer of the partial file of a result."""
+        path = self.path(key, partial=True)
+        if os.path.exists(path):
+            os.remove(path)
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = 'GPKG'
+        options.layerName = LAYER_NAME
+        writer = QgsVectorFileWriter.create(
+            path,
+            fields,
+            wkb_type,
+            crs,
+            transform_context,
+            options
+        )
+        if writer.hasError() != QgsVectorFileWriter.NoError:
+            return None
+        return writer
+
+    def commit(self, key):
+        """Make the partial file of a result complete and evict old ones.
+
+        The writer of the result must be deleted before.
+        """
+        os.replace(self.path(key, partial=True), self.path(key))
+        self.evict()
+
+    def discard(self, key):
+        """Remove the partial file of a result."""
+        path = self.path(key, partial=True)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def evict(self):
+        """Remove the least recently used results above the maximum size.
+
+        Return the count of removed results.
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.folder, '*.gpkg')):
+            if path.endswith('.part.gpkg'):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Vectorized distance transforms of raster masks.
+
+************************************************************************
+    Name                : distance.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+from math import ceil, floor
+
+import numpy as np
+
+
+def row_distance(mask, limit):
+    """Return the distance along each row to the nearest True pixel.
+
+    Distances are in pixels, and capped at 'limit'.
+    """
+    cols = np.arange(mask.shape[1])
+    last = np.where(mask, cols, -limit - 1)
+    last = np.maximum.accumulate(last, axis=1)
+    following = np.where(mask, cols, mask.shape[1] + limit)
+    following = np.minimum.accumulate(following[:, ::-1], axis=1)[:, ::-1]
+    return np.minimum(
+        np.minimum(cols - last, following - cols),
+        limit
+    ).astype(np.float64)
+
+
+def bounded_distance(mask, radius):
+    """Return the Euclidean distance to the nearest True pixel of a mask.
+
+    The distance is exact up to 'radius' pixels, and any larger distance
+        is returned as infinity. Distances along rows are combined with
+        those of the rows up to 'radius' away, with one array operation
+        per row offset.
+    """
+    limit = int(ceil(radius))
+    horizontal = row_distance(mask, limit + 1) ** 2
+    horizontal[horizontal > limit ** 2] = np.inf
+    squared = horizontal.copy()
+    rows = mask.shape[0]
+    for offset in range(1, limit + 1):
+        if offset >= rows:
+            break
+        step = offset ** 2
+        np.minimum(
+            squared[offset:],
+            horizontal[:-offset] + step,
+            out=squared[offset:]
+        )
+        np.minimum(
+            squared[:-offset],
+            horizontal[offset:] + step,
+            out=squared[:-offset]
+        )
+    distance = np.sqrt(squared)
+    distance[distance > radius] = np.inf
+    return distance
+
+
+def band(mask, half_width):
+    """Return the mask of the pixels within 'half_width' pixels of a mask.
+
+    Burned pixels are taken as touched by the lines, with their centers
+        half a pixel from the lines on average, so that half pixel is
+        removed from the distance.
+    """
+    radius = max(half_width - 0.5, 0)
+    if floor(radius) == 0:
+        return mask.copy()
+    return bounded_distance(mask, radius) <= radius
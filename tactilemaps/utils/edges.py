@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+"""Geometry operations to extract the edges of polygons.
+
+************************************************************************
+    Name                : edges.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from math import acos, ceil, floor, pi, sqrt
+
+import numpy as np
+
+from qgis.core import (
+    QgsGeometry,
+    QgsSpatialIndex,
+    QgsWkbTypes
+)
+
+from tactilemaps.utils import wkb
+
+# Douglas-Peucker tolerance (tenths of milimeter).
+TOLERANCE = 1
+
+# Buffer segments per quarter circle.
+SEGMENTS = 5
+
+# Mean count of geometries per tile when the tile size is automatic.
+TILE_GEOMETRIES = 64
+
+# Grid size to match the vertices of shared segments (tenths of milimeter).
+SNAP = 1e-6
+
+# WKB record of a two point line string.
+SEGMENT_WKB = np.dtype([
+    ("order", "u1"),
+    ("type", "<u4"),
+    ("count", "<u4"),
+    ("coords", "<f8", (4,))
+])
+
+
+def fix(geom):
+    """Return a valid version of a polygon geometry, as Fix geometries does.
+
+    Collections returned by the repair are reduced to their polygons.
+    """
+    if geom.isNull():
+        return geom
+    fixed = geom.makeValid()
+    flat_type = QgsWkbTypes.flatType(fixed.wkbType())
+    if flat_type in (QgsWkbTypes.Unknown, QgsWkbTypes.GeometryCollection):
+        fixed.convertGeometryCollectionToSubclass(
+            QgsWkbTypes.PolygonGeometry
+        )
+    return fixed
+
+
+class Repairs:
+    """Repair only the invalid geometries, counting checks and repairs.
+
+    Counters are shared by the worker threads.
+    """
+
+    def __init__(self):
+        """Start with zero counters."""
+        self.checked = 0
+        self.repaired = 0
+        self.lock = threading.Lock()
+
+    def is_valid(self, geom):
+        """Return True if a geometry is valid according to GEOS."""
+        valid = geom.isNull() or geom.isGeosValid()
+        with self.lock:
+            self.checked += 1
+        return valid
+
+    def fix(self, geom):
+        """Return the geometry if it is valid, or a fixed copy otherwise."""
+        if self.is_valid(geom):
+            return geom
+        with self.lock:
+            self.repaired += 1
+        return fix(geom)
+
+    def report(self, feedback):
+        """Push the counters to the feedback."""
+        feedback.pushInfo(
+            f'Geometry validity: {self.checked} checked, '
+            f'{self.repaired} repaired.'
+        )
+
+
+def resolution_settings(resolution, width):
+    """Return the simplify tolerance and buffer segments for a resolution.
+
+    The tolerance is half of the 'resolution', and the segments per quarter
+        circle are the fewest that keep the sagitta of the arcs of a buffer
+        of half of the 'width' within the tolerance.
+    Return a tuple of the tolerance and the segments.
+    """
+    tolerance = resolution / 2.0
+    radius = width / 2.0
+    if radius <= tolerance:
+        return tolerance, 1
+    angle = 2 * acos(1 - tolerance / radius)
+    return tolerance, max(1, ceil(pi / 2 / angle))
+
+
+def simplify(geom, tolerance, preserve_topology=False):
+    """Return a geometry simplified with the Douglas-Peucker algorithm.
+
+    If 'preserve_topology' is True, GEOS keeps rings from collapsing or
+        crossing each other, at a higher cost.
+    """
+    if not preserve_topology or geom.isNull():
+        return geom.simplify(tolerance)
+    engine = QgsGeometry.createGeometryEngine(geom.constGet())
+    simplified = engine.simplify(tolerance)
+    if simplified is None:
+        return geom.simplify(tolerance)
+    return QgsGeometry(simplified)
+
+
+def singleparts(geom):
+    """Return the list of single part geometries of a geometry."""
+    if geom.isNull():
+        return []
+    if geom.isMultipart():
+        return geom.asGeometryCollection()
+    return [QgsGeometry(geom)]
+
+
+def buffer_part(part, width, tolerance=TOLERANCE, segments=SEGMENTS,
+                repairs=None, preserve_topology=False):
+    """Return the outer and inner buffers of a valid single part geometry.
+
+    The part is simplified and repaired if needed, and then buffered
+        by half of the width to both sides, with round caps and joins.
+    """
+    if repairs is None:
+        repairs = Repairs()
+    part = repairs.fix(simplify(part, tolerance, preserve_topology))
+    outer = repairs.fix(part.buffer(width / 2.0, segments))
+    inner = repairs.fix(part.buffer(-width / 2.0, segments))
+    return outer, inner
+
+
+def buffer_geometry(geom, width, tolerance=TOLERANCE, segments=SEGMENTS,
+                    repairs=None, preserve_topology=False):
+    """Return a list of (outer, inner) buffers for each part of a geometry.
+
+    The parts of a valid geometry are valid, so they are only checked
+        and repaired one by one if the whole geometry is invalid.
+    """
+    if repairs is None:
+        repairs = Repairs()
+    valid = repairs.is_valid(geom)
+    return [
+        buffer_part(
+            part if valid else repairs.fix(part),
+            width,
+            tolerance,
+            segments,
+            repairs,
+            preserve_topology
+        )
+        for part in singleparts(geom)
+    ]
+
+
+def map_ordered(function, items, workers=1, feedback=None):
+    """Apply a function to every item and return the results in order.
+
+    With more than one worker, items are processed in a thread pool, as
+        GEOS operations release the GIL.
+    Once the feedback is canceled the pending items return None.
+    """
+    def task(item):
+        if feedback is not None and feedback.isCanceled():
+            return None
+        return function(item)
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(task, items))
+    return [task(item) for item in items]
+
+
+def subtract_inner(outers, inners, workers=1, feedback=None, repairs=None):
+    """Subtract the inner buffers from each outer buffer.
+
+    As in the Difference algorithm, every outer buffer is subtracted by
+        all the inner buffers that intersect it, not only its own one.
+    Return the list of non empty differences, in the order of 'outers'.
+    """
+    if repairs is None:
+        repairs = Repairs()
+    index = QgsSpatialIndex()
+    for i, inner in enumerate(inners):
+        if not inner.isEmpty():
+            index.addFeature(i, inner.boundingBox())
+
+    def difference(outer):
+        if outer.isEmpty():
+            return outer
+        engine = QgsGeometry.createGeometryEngine(outer.constGet())
+        engine.prepareGeometry()
+        overlay = [
+            inners[i] for i in index.intersects(outer.boundingBox())
+            if engine.intersects(inners[i].constGet())
+        ]
+        if not overlay:
+            return outer
+        return repairs.fix(
+            outer.difference(QgsGeometry.unaryUnion(overlay))
+        )
+
+    rings = map_ordered(difference, outers, workers, feedback)
+    return [ring for ring in rings if ring is not None and not ring.isEmpty()]
+
+
+def dissolve(geoms, repairs=None):
+    """Return the union of a list of geometries, repaired if needed."""
+    if not geoms:
+        return QgsGeometry()
+    if repairs is None:
+        repairs = Repairs()
+    return repairs.fix(QgsGeometry.unaryUnion(geoms))
+
+
+def tile_geometries(geoms, tile_size=0):
+    """Group geometries in a grid by the center of their bounding boxes.
+
+    A 'tile_size' of zero chooses a size with about TILE_GEOMETRIES
+        geometries per tile over the extent of all the geometries.
+    Return a tuple of the tile size and a dict of lists of geometries
+        keyed by the (column, row) of their tile.
+    """
+    extent = geoms[0].boundingBox()
+    for geom in geoms[1:]:
+        extent.combineExtentWith(geom.boundingBox())
+    if tile_size <= 0:
+        tiles_count = ceil(len(geoms) / TILE_GEOMETRIES)
+        tile_size = sqrt(extent.width() * extent.height() / tiles_count)
+        if tile_size <= 0:
+            tile_size = max(extent.width(), extent.height(), 1)
+    tiles = {}
+    for geom in geoms:
+        center = geom.boundingBox().center()
+        key = (
+            floor((center.x() - extent.xMinimum()) / tile_size),
+            floor((center.y() - extent.yMinimum()) / tile_size)
+        )
+        tiles.setdefault(key, []).append(geom)
+    return tile_size, tiles
+
+
+def cascaded_union(geoms, tile_size=0, split=False, workers=1,
+                   feedback=None, repairs=None):
+    """Dissolve geometries bottom-up over a grid of tiles.
+
+    Geometries are first dissolved by tile, and then the tiles are
+        merged by 2x2 blocks until a single geometry is left, so every
+        union works with a bounded number of nearby geometries.
+    If 'split' is True, return the list of dissolved tiles without merging
+        them, otherwise return a list with the single dissolved geometry.
+    """
+    geoms = [geom for geom in geoms if not geom.isEmpty()]
+    if not geoms:
+        return []
+    _, tiles = tile_geometries(geoms, tile_size)
+    while True:
+        keys = sorted(tiles)
+        unions = map_ordered(
+            lambda key: dissolve(tiles[key], repairs),
+            keys,
+            workers,
+            feedback
+        )
+        if feedback is not None and feedback.isCanceled():
+            return []
+        if split or len(keys) == 1:
+            return [geom for geom in unions if not geom.isEmpty()]
+        tiles = {}
+        for (col, row), geom in zip(keys, unions):
+            tiles.setdefault((col // 2, row // 2), []).append(geom)
+
+
+def extract_edges(geoms, width, tolerance=TOLERANCE, segments=SEGMENTS,
+                  tile_size=0, split=False, workers=1, feedback=None,
+                  repairs=None, preserve_topology=False):
+    """Return the edges of geometries, buffered to fill a width.
+
+    Each geometry is processed in memory, part by part, optionally by
+        several worker threads, and all the edges are dissolved with a
+        cascaded union at the end.
+    Only invalid geometries are repaired, by 'repairs'.
+    If 'preserve_topology' is True, the simplification keeps the rings
+        from collapsing, as needed with tolerances close to the width.
+    Return a list with the dissolved edges, or with the edges dissolved
+        by tile if 'split' is True.
+    """
+    if repairs is None:
+        repairs = Repairs()
+    buffered = map_ordered(
+        lambda geom: buffer_geometry(
+            geom,
+            width,
+            tolerance,
+            segments,
+            repairs,
+            preserve_topology
+        ),
+        geoms,
+        workers,
+        feedback
+    )
+    if feedback is not None and feedback.isCanceled():
+        return []
+    outers = []
+    inners = []
+    for parts in buffered:
+        for outer, inner in parts:
+            outers.append(outer)
+            inners.append(inner)
+    rings = subtract_inner(outers, inners, workers, feedback, repairs)
+    if feedback is not None and feedback.isCanceled():
+        return []
+    return cascaded_union(
+        rings,
+        tile_size,
+        split,
+        workers,
+        feedback,
+        repairs
+    )
+
+
+def ring_segments(geom):
+    """Return the (M, 4) array of the segments of the rings of a geometry.
+
+    Curved geometries are segmentized first.
+    """
+    if QgsWkbTypes.isCurvedType(geom.wkbType()):
+        geom = QgsGeometry(geom)
+        geom.convertToStraightSegment()
+    data = bytes(geom.asWkb())
+    _, runs = wkb.coordinate_runs(data)
+    segments = []
+    for offset, count, dims in runs:
+        if count < 2:
+            continue
+        coords = np.frombuffer(
+            data,
+            dtype="<f8",
+            count=count * dims,
+            offset=offset
+        ).reshape(count, dims)[:, :2]
+        segments.append(np.hstack([coords[:-1], coords[1:]]))
+    if not segments:
+        return np.empty((0, 4))
+    return np.concatenate(segments)
+
+
+def unique_segments(geoms, snap=SNAP):
+    """Return the segments of the boundaries of geometries, without repeats.
+
+    Segments are keyed by their end points snapped to a grid, in either
+        direction, so a boundary shared by two polygons is kept once.
+    """
+    segments = [ring_segments(geom) for geom in geoms if not geom.isEmpty()]
+    if not segments:
+        return np.empty((0, 4))
+    segments = np.concatenate(segments)
+    # Same direction for both copies of a shared segment.
+    start = segments[:, :2]
+    end = segments[:, 2:]
+    swap = (start[:, 0] > end[:, 0]) | (
+        (start[:, 0] == end[:, 0]) & (start[:, 1] > end[:, 1])
+    )
+    segments[swap] = segments[swap][:, [2, 3, 0, 1]]
+    keys = np.round(segments / snap).astype(np.int64)
+    not_empty = (keys[:, :2] != keys[:, 2:]).any(axis=1)
+    segments = segments[not_empty]
+    keys = keys[not_empty]
+    _, first = np.unique(keys, axis=0, return_index=True)
+    return segments[np.sort(first)]
+
+
+def segments_to_lines(segments):
+    """Return a MultiLineString geometry of an (M, 4) array of segments."""
+    records = np.empty(len(segments), dtype=SEGMENT_WKB)
+    records["order"] = 1
+    records["type"] = 2
+    records["count"] = 2
+    records["coords"] = segments
+    header = np.array(
+        [(1, 5, len(segments))],
+        dtype=[("order", "u1"), ("type", "<u4"), ("count", "<u4")]
+    )
+    geom = QgsGeometry()
+    geom.fromWkb(header.tobytes() + records.tobytes())
+    return geom
+
+
+def extract_shared_edges(geoms, width, tolerance=TOLERANCE,
+                         segments=SEGMENTS, tile_size=0, split=False,
+                         workers=1, feedback=None, repairs=None,
+                         preserve_topology=False):
+    """Return the edges of geometries, buffering shared boundaries once.
+
+    The boundaries of all the valid or repaired geometries are reduced to
+        a network of unique segments, merged into lines and simplified,
+        and each line is buffered by half of the width to both sides.
+        The edges are the same as extract_edges returns, but boundaries
+        shared by adjacent polygons are buffered once instead of twice.
+    Return a list with the dissolved edges, or with the edges dissolved
+        by tile if 'split' is True.
+    """
+    if repairs is None:
+        repairs = Repairs()
+    fixed = map_ordered(
+        repairs.fix,
+        geoms,
+        workers,
+        feedback
+    )
+    if feedback is not None and feedback.isCanceled():
+        return []
+    network = unique_segments([geom for geom in fixed if geom is not None])
+    if not len(network):
+        return []
+    lines = simplify(
+        segments_to_lines(network).mergeLines(),
+        tolerance,
+        preserve_topology
+    )
+    buffers = map_ordered(
+        lambda line: repairs.fix(line.buffer(width / 2.0, segments)),
+        singleparts(lines),
+        workers,
+        feedback
+    )
+    if feedback is not None and feedback.isCanceled():
+        return []
+    return cascaded_union(
+        buffers,
+        tile_size,
+        split,
+        workers,
+        feedback,
+        repairs
+    )
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""Build and write solid triangle meshes from height maps.
+
+************************************************************************
+    Name                : mesh.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+# Millimeters per map unit (tenths of milimeter).
+MM_PER_UNIT = 0.1
+
+# Smallest level of the flat squares merged by the quadtree, as squares of
+# 2 cells per side would take as many triangles merged as not.
+MIN_LEVEL = 2
+
+# Rows of the height map meshed at once by the export algorithm.
+STRIP_ROWS = 256
+
+# Rows written to a 3MF model by each string formatting.
+XML_BATCH = 65536
+
+# 3MF vertex record, sorted and searched in the order of the coordinates.
+VERTEX = np.dtype([("x", "<f4"), ("y", "<f4"), ("z", "<f4")])
+
+# Binary STL triangle record.
+STL_TRIANGLE = np.dtype([
+    ("normal", "<f4", 3),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2")
+])
+
+
+def normals(triangles):
+    """Return the unit normals of a (M, 3, 3) array of triangles."""
+    cross = np.cross(
+        triangles[:, 1] - triangles[:, 0],
+        triangles[:, 2] - triangles[:, 0]
+    )
+    length = np.linalg.norm(cross, axis=1, keepdims=True)
+    length[length == 0] = 1
+    return cross / length
+
+
+def orient(triangles, outward):
+    """Flip the triangles whose normal is opposite to 'outward'.
+
+    'outward' is a 3 items direction, and the triangles are flipped in
+        place by swapping their last two vertices.
+    """
+    flip = normals(triangles) @ np.asarray(outward, dtype=np.float64) < 0
+    triangles[flip, 1:] = triangles[flip, :0:-1]
+    return triangles
+
+
+def grid_vertices(heights, first_row, geotransform, base):
+    """Return the (k, C, 3) top vertices of a block of rows of a height map.
+
+    Vertices are placed at the pixel centers, raised 'base' over the
+        heights, and converted to millimeters.
+    """
+    rows, cols = heights.shape
+    x = geotransform[0] + (np.arange(cols) + 0.5) * geotransform[1]
+    y = geotransform[3] + (np.arange(rows) + first_row + 0.5) * geotransform[5]
+    vertices = np.empty((rows, cols, 3))
+    vertices[:, :, 0] = x[None, :]
+    vertices[:, :, 1] = y[:, None]
+    vertices[:, :, 2] = base + heights
+    return vertices * MM_PER_UNIT
+
+
+def surface_triangles(vertices, covered=None):
+    """Return two triangles per grid cell of a (k, C, 3) vertex grid.
+
+    Triangles are counterclockwise seen from above. Cells where the
+        (k - 1, C - 1) 'covered' mask is True are left out.
+    """
+    a = vertices[:-1, :-1]
+    b = vertices[1:, :-1]
+    c = vertices[:-1, 1:]
+    d = vertices[1:, 1:]
+    first = np.stack([a, b, c], axis=2)
+    second = np.stack([b, d, c], axis=2)
+    if covered is not None:
+        first = first[~covered]
+        second = second[~covered]
+    return np.concatenate([first.reshape(-1, 3, 3), second.reshape(-1, 3, 3)])
+
+
+def flat_quads(heights, tolerance, min_level=MIN_LEVEL):
+    """Find the flat squares of cells of a height grid with a quadtree.
+
+    Squares of 2**level cells per side, aligned to multiples of their
+        size, are flat when the range of the heights of their vertices
+        is not greater than 'tolerance'. Larger squares are taken first
+        and the smaller ones only fill the cells not already taken.
+    Return a tuple of the (k - 1, C - 1) mask of the cells covered by
+        flat squares and a list of (rows, cols, size) tuples, with the
+        arrays of the first cell of the squares of each size.
+    """
+    cell_min = np.minimum.reduce([
+        heights[:-1, :-1], heights[1:, :-1], heights[:-1, 1:], heights[1:, 1:]
+    ])
+    cell_max = np.maximum.reduce([
+        heights[:-1, :-1], heights[1:, :-1], heights[:-1, 1:], heights[1:, 1:]
+    ])
+    covered = np.zeros(cell_min.shape, dtype=bool)
+    quads = []
+    top_level = int(np.log2(max(min(cell_min.shape), 1)))
+    for level in range(top_level, min_level - 1, -1):
+        size = 2 ** level
+        n_rows = cell_min.shape[0] // size
+        n_cols = cell_min.shape[1] // size
+        shape = (n_rows, size, n_cols, size)
+        window = (slice(0, n_rows * size), slice(0, n_cols * size))
+        low = cell_min[window].reshape(shape).min(axis=(1, 3))
+        high = cell_max[window].reshape(shape).max(axis=(1, 3))
+        # Aligned squares are either inside a larger one or apart from it.
+        taken = covered[window].reshape(shape).any(axis=(1, 3))
+        chosen = (high - low <= tolerance) & ~taken
+        if not chosen.any():
+            continue
+        covered[window] |= np.repeat(np.repeat(chosen, size, 0), size, 1)
+        rows, cols = np.nonzero(chosen)
+        quads.append((rows * size, cols * size, size))
+    return covered, quads
+
+
+def quad_triangles(vertices, rows, cols, size):
+    """Return the triangles of flat squares of a (k, C, 3) vertex grid.
+
+    Each square is a fan from its center over all the grid vertices on
+        its border, so it shares every edge with its neighbors, merged
+        or not, and the surface is kept closed.
+    """
+    side = np.arange(size)
+    ring_rows = np.concatenate([
+        np.zeros(size, int), side, np.full(size, size), size - side
+    ])
+    ring_cols = np.concatenate([
+        side, np.full(size, size), size - side, np.zeros(size, int)
+    ])
+    ring = vertices[
+        rows[:, None] + ring_rows[None, :],
+        cols[:, None] + ring_cols[None, :]
+    ]
+    center = ring.mean(axis=1, keepdims=True)
+    fan = np.stack([
+        np.broadcast_to(center, ring.shape),
+        ring,
+        np.roll(ring, -1, axis=1)
+    ], axis=2).reshape(-1, 3, 3)
+    return orient(fan, (0, 0, 1))
+
+
+def decimated_surface(vertices, heights, tolerance):
+    """Return the top surface of a vertex grid, merging flat regions.
+
+    Flat squares found by flat_quads() get a fan of triangles over their
+        border, and the rest of the cells two triangles each.
+    """
+    covered, quads = flat_quads(heights, tolerance)
+    return np.concatenate(
+        [surface_triangles(vertices, covered)]
+        + [quad_triangles(vertices, *quad) for quad in quads]
+    )
+
+
+def _wall(top, outward):
+    """Return the triangles of a wall below a (n, 3) line of vertices."""
+    bottom = top.copy()
+    bottom[:, 2] = 0
+    first = np.stack([top[:-1], bottom[:-1], top[1:]], axis=1)
+    second = np.stack([bottom[:-1], bottom[1:], top[1:]], axis=1)
+    return orient(np.concatenate([first, second]), outward)
+
+
+def closure_triangles(vertices, first, last):
+    """Return the walls and bottom of a strip of a (k, C, 3) vertex grid.
+
+    Walls go down from the border vertices to zero height. The bottom is
+        a fan over the border vertices of the strip, with only the
+        corners on the sides shared with other strips, so strips meet
+        on the same vertices. 'first' and 'last' tell if the strip has
+        the first and the last rows of the map.
+    """
+    walls = [
+        _wall(vertices[:, 0], (-1, 0, 0)),
+        _wall(vertices[:, -1], (1, 0, 0))
+    ]
+    if first:
+        walls.append(_wall(vertices[0], (0, 1, 0)))
+    if last:
+        walls.append(_wall(vertices[-1], (0, -1, 0)))
+
+    # Border of the strip, around it.
+    top_side = vertices[0] if first else vertices[0, [0, -1]]
+    bottom_side = vertices[-1] if last else vertices[-1, [0, -1]]
+    border = np.concatenate([
+        top_side,
+        vertices[1:-1, -1],
+        bottom_side[::-1],
+        vertices[-2:0:-1, 0]
+    ])
+    border[:, 2] = 0
+    center = border.mean(axis=0)
+    fan = np.stack([
+        np.broadcast_to(center, border.shape),
+        border,
+        np.roll(border, -1, axis=0)
+    ], axis=1)
+    walls.append(orient(fan, (0, 0, -1)))
+    return np.concatenate(walls)
+
+
+def iter_strips(blocks, strip_rows=STRIP_ROWS):
+    """Split height map blocks into strips of at most 'strip_rows' rows.
+
+    'blocks' yields (offset, block) tuples of consecutive rows, of any
+        size, and the strips are yielded as (offset, strip) tuples in
+        the same way, as views of the blocks.
+    """
+    for offset, block in blocks:
+        for start in range(0, block.shape[0], strip_rows):
+            yield offset + start, block[start:start + strip_rows]
+
+
+def iter_mesh(blocks, n_rows, geotransform, base, tolerance=None):
+    """Yield the triangles of a solid built from height map blocks.
+
+    'blocks' yields (offset, block) tuples of consecutive rows of a height
+        map with 'n_rows' rows, as smoothing.iter_smoothed_blocks does.
+    Each block is meshed with the last row of the previous one, so only
+        a block of rows is held in memory.
+    If a 'tolerance' is given, flat regions of each block are merged
+        with a quadtree (see flat_quads) before the triangulation.
+    Yield tuples of the count of rows meshed so far and a (M, 3, 3) array
+        of triangles.
+    """
+    previous = None
+    for offset, block in blocks:
+        if previous is not None:
+            block = np.vstack([previous, block])
+            offset -= 1
+        if block.shape[0] < 2:
+            previous = block
+            continue
+        vertices = grid_vertices(block, offset, geotransform, base)
+        first = offset == 0
+        last = offset + block.shape[0] == n_rows
+        if tolerance is None:
+            surface = surface_triangles(vertices)
+        else:
+            surface = decimated_surface(vertices, block, tolerance)
+        yield offset + block.shape[0], np.concatenate([
+            surface,
+            closure_triangles(vertices, first, last)
+        ])
+        previous = block[-1:]
+
+
+class StlWriter:
+    """Stream triangles to a binary STL file."""
+
+    def __init__(self, path):
+        """Open the file and write a header with a placeholder count."""
+        self.file = open(path, "wb")
+        self.file.write(b"tactilemaps".ljust(80, b" "))
+        self.file.write(np.uint32(0).tobytes())
+        self.count = 0
+
+    def write(self, triangles):
+        """Write a (M, 3, 3) array of triangles."""
+        records = np.zeros(len(triangles), dtype=STL_TRIANGLE)
+        records["normal"] = normals(triangles)
+        records["vertices"] = triangles
+        records.tofile(self.file)
+        self.count += len(triangles)
+
+    def close(self):
+        """Write the triangle count and close the file."""
+        self.file.seek(80)
+        self.file.write(np.array(self.count, dtype="<u4").tobytes())
+        self.file.close()
+
+
+class ThreeMfWriter:
+    """Stream triangles to a 3MF package with an indexed mesh.
+
+    Vertices are merged inside each write, and with the vertices of the
+        previous write on their shared row, so consecutive strips of a
+        mesh share their seam vertices. Triangles are spooled to a
+        temporary file until the vertices are complete.
+    """
+
+    NAMESPACE = "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"
+    CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'content-types">'
+        '<Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="model" ContentType="application/'
+        'vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+        '</Types>'
+    )
+    RELS = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/'
+        '2006/relationships">'
+        '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+        'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/'
+        '3dmodel"/>'
+        '</Relationships>'
+    )
+
+    def __init__(self, path):
+        """Open the package and start the model vertices."""
+        self.package = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        self.package.writestr("[Content_Types].xml", self.CONTENT_TYPES)
+        self.package.writestr("_rels/.rels", self.RELS)
+        self.model = self.package.open(
+            "3D/3dmodel.model",
+            "w",
+            force_zip64=True
+        )
+        self.model.write(
+            f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<model unit="millimeter" xml:lang="en-US" '
+            f'xmlns="{self.NAMESPACE}">'
+            f'<resources><object id="1" type="model"><mesh><vertices>\n'
+            .encode()
+        )
+        self.triangles = tempfile.TemporaryFile()
+        self.count = 0
+        self.seam_keys = np.empty(0, dtype=VERTEX)
+        self.seam_index = np.empty(0, dtype=np.int64)
+
+    def write(self, triangles):
+        """Write a (M, 3, 3) array of triangles."""
+        coords = np.asarray(triangles, dtype=np.float32).reshape(-1, 3)
+        unique, inverse = np.unique(coords, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        keys = np.ascontiguousarray(unique).view(VERTEX).reshape(-1)
+        # Vertices of the seam row of the previous write keep their index.
+        index = np.empty(len(unique), dtype=np.int64)
+        new = np.ones(len(unique), dtype=bool)
+        if len(self.seam_keys):
+            found = np.searchsorted(self.seam_keys, keys)
+            found = np.minimum(found, len(self.seam_keys) - 1)
+            shared = self.seam_keys[found] == keys
+            index[shared] = self.seam_index[found[shared]]
+            new[shared] = False
+        index[new] = self.count + np.arange(np.count_nonzero(new))
+        self.count += int(np.count_nonzero(new))
+        write_rows(
+            self.model,
+            '<vertex x="%.4f" y="%.4f" z="%.4f"/>\n',
+            unique[new]
+        )
+        write_rows(
+            self.triangles,
+            '<triangle v1="%d" v2="%d" v3="%d"/>\n',
+            index[inverse].reshape(-1, 3)
+        )
+        # The lowest row of this write is shared with the next one.
+        seam = np.nonzero(unique[:, 1] == unique[:, 1].min())[0]
+        seam = seam[np.argsort(keys[seam])]
+        self.seam_keys = keys[seam]
+        self.seam_index = index[seam]
+
+    def close(self):
+        """Append the triangles, close the model and the package."""
+        self.model.write(b"</vertices><triangles>\n")
+        self.triangles.seek(0)
+        shutil.copyfileobj(self.triangles, self.model)
+        self.triangles.close()
+        self.model.write(
+            b'</triangles></mesh></object></resources>'
+            b'<build><item objectid="1"/></build></model>\n'
+        )
+        self.model.close()
+        self.package.close()
+
+
+def write_rows(file, fmt, rows, batch=XML_BATCH):
+    """Write the rows of a 2-D array to a binary file with a format.
+
+    Rows are formatted by batches, with a single string operation for
+        each batch of rows.
+    """
+    for start in range(0, len(rows), batch):
+        chunk = rows[start:start + batch]
+        file.write(
+            ((fmt * len(chunk)) % tuple(chunk.ravel().tolist())).encode()
+        )
+
+
+def writer_for(path):
+    """Return a STL or 3MF writer, by the extension of 'path'."""
+    if path.lower().endswith(".3mf"):
+        return ThreeMfWriter(path)
+    return StlWriter(path)
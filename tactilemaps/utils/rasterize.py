@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""Burn vector layers into GDAL raster datasets.
+
+************************************************************************
+    Name                : rasterize.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from osgeo import gdal, ogr, osr
+
+from qgis.core import (
+    NULL,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsProcessingException,
+    QgsProviderRegistry,
+    QgsVectorLayerFeatureSource
+)
+
+# Output data types: (name, GDAL type, NumPy type, GeoTIFF predictor).
+OUTPUT_TYPES = (
+    ('Float32', gdal.GDT_Float32, np.float32, 3),
+    ('UInt8', gdal.GDT_Byte, np.uint8, 2),
+    ('UInt16', gdal.GDT_UInt16, np.uint16, 2),
+)
+
+
+def map_grid(extent, pixel_size):
+    """Return the grid of a map covering an extent.
+
+    The grid is computed as gdal_rasterize does from a target extent and
+        resolution, so every algorithm rasterizing a map from the same
+        extent and pixel size gets the same pixels.
+    Return a tuple of the columns, the rows and the GDAL geotransform.
+    """
+    x_size = int(0.5 + extent.width() / pixel_size)
+    y_size = int(0.5 + extent.height() / pixel_size)
+    geotransform = (
+        extent.xMinimum(),
+        pixel_size,
+        0.0,
+        extent.yMaximum(),
+        0.0,
+        -pixel_size
+    )
+    return x_size, y_size, geotransform
+
+
+def pad_grid(grid, pad):
+    """Return a grid of map_grid with 'pad' more pixels on every side."""
+    x_size, y_size, geotransform = grid
+    x_min, x_res, x_rot, y_max, y_rot, y_res = geotransform
+    return (
+        x_size + 2 * pad,
+        y_size + 2 * pad,
+        (x_min - pad * x_res, x_res, x_rot, y_max - pad * y_res, y_rot, y_res)
+    )
+
+
+def create_dataset(extent, pixel_size, crs_wkt, path=None, pad=0):
+    """Create a single band Float32 dataset covering an extent.
+
+    The grid is the one of map_grid, with 'pad' more pixels on every side,
+        and the band is filled with zeros.
+    If 'path' is None the dataset is created in memory, otherwise it is
+        created as a GeoTIFF file in 'path'.
+    """
+    x_size, y_size, geotransform = pad_grid(map_grid(extent, pixel_size), pad)
+    if path is None:
+        driver = gdal.GetDriverByName('MEM')
+        path = ''
+        options = []
+    else:
+        driver = gdal.GetDriverByName('GTiff')
+        options = ['TILED=YES', 'SPARSE_OK=TRUE']
+    dataset = driver.Create(
+        path,
+        x_size,
+        y_size,
+        1,
+        gdal.GDT_Float32,
+        options=options
+    )
+    dataset.SetProjection(crs_wkt)
+    dataset.SetGeoTransform(geotransform)
+    dataset.GetRasterBand(1).Fill(0)
+    return dataset
+
+
+def open_ogr_layer(layer, extent=None):
+    """Open the OGR layer behind a QGIS vector layer.
+
+    If an 'extent' rectangle is given, it is set as the spatial filter of
+        the OGR layer, which uses the layer spatial index if there is one.
+    Return a tuple of the OGR datasource and layer, which must be kept
+        alive together, or (None, None) if the QGIS layer can not be read
+        directly by OGR: not an OGR provider, unsaved edits or a subset
+        string that OGR does not understand.
+    """
+    if layer.providerType() != 'ogr' or layer.isModified():
+        return None, None
+    parts = QgsProviderRegistry.instance().decodeUri('ogr', layer.source())
+    datasource = ogr.Open(parts.get('path', ''))
+    if datasource is None:
+        return None, None
+    if parts.get('layerName'):
+        ogr_layer = datasource.GetLayerByName(parts['layerName'])
+    elif parts.get('layerId') is not None:
+        ogr_layer = datasource.GetLayer(int(parts['layerId']))
+    else:
+        ogr_layer = datasource.GetLayer(0)
+    if ogr_layer is None:
+        return None, None
+    subset = layer.subsetString()
+    if subset and ogr_layer.SetAttributeFilter(subset) != 0:
+        return None, None
+    if extent is not None:
+        ogr_layer.SetSpatialFilterRect(
+            extent.xMinimum(),
+            extent.yMinimum(),
+            extent.xMaximum(),
+            extent.yMaximum()
+        )
+    return datasource, ogr_layer
+
+
+def feature_request(layer, field_name, extent=None):
+    """Return a request for the 'field_name' values of a layer's features.
+
+    If an 'extent' rectangle is given, only features intersecting it are
+        requested, using the provider spatial index if there is one.
+    """
+    request = QgsFeatureRequest()
+    request.setSubsetOfAttributes([field_name], layer.fields())
+    if extent is not None:
+        request.setFilterRect(extent)
+    return request
+
+
+def feature_records(features, field_name, clip_extent=None):
+    """Yield (WKB, value) records of features with a geometry.
+
+    Only the geometry, as WKB, and the 'field_name' value are kept.
+    If a 'clip_extent' rectangle is given, geometries are clipped to it.
+    """
+    for feat in features:
+        geom = feat.geometry()
+        if clip_extent is not None and not geom.isNull():
+            geom = geom.clipped(clip_extent)
+        if geom.isNull() or geom.isEmpty():
+            continue
+        val = feat[field_name]
+        if val is not None and val != NULL:
+            val = float(val)
+        else:
+            val = None
+        yield bytes(geom.asWkb()), val
+
+
+def ogr_records(ogr_layer, field_name, clip_extent):
+    """Yield (WKB, value) records of the features of an OGR layer.
+
+    Geometries are clipped to the 'clip_extent' rectangle by QGIS, as in
+        feature_records, so both read paths burn the same geometries.
+    """
+    index = ogr_layer.GetLayerDefn().GetFieldIndex(field_name)
+    for ogr_feat in ogr_layer:
+        ogr_geom = ogr_feat.GetGeometryRef()
+        if ogr_geom is None:
+            continue
+        geom = QgsGeometry()
+        geom.fromWkb(bytes(ogr_geom.ExportToIsoWkb()))
+        geom = geom.clipped(clip_extent)
+        if geom.isNull() or geom.isEmpty():
+            continue
+        val = None
+        if index >= 0 and ogr_feat.IsFieldSetAndNotNull(index):
+            val = float(ogr_feat.GetField(index))
+        yield bytes(geom.asWkb()), val
+
+
+def records_to_ogr_layer(records, field_name, crs_wkt):
+    """Copy (WKB, value) records into an OGR memory layer.
+
+    Return a tuple of the OGR datasource and layer.
+    """
+    srs = osr.SpatialReference()
+    srs.ImportFromWkt(crs_wkt)
+    datasource = ogr.GetDriverByName('Memory').CreateDataSource('')
+    ogr_layer = datasource.CreateLayer('burn', srs, ogr.wkbUnknown)
+    ogr_layer.CreateField(ogr.FieldDefn(field_name, ogr.OFTReal))
+    definition = ogr_layer.GetLayerDefn()
+    for wkb, val in records:
+        ogr_feat = ogr.Feature(definition)
+        ogr_feat.SetGeometryDirectly(ogr.CreateGeometryFromWkb(wkb))
+        if val is not None:
+            ogr_feat.SetField(0, val)
+        ogr_layer.CreateFeature(ogr_feat)
+    return datasource, ogr_layer
+
+
+def burn_ogr_layer(dataset, ogr_layer, field_name, clip_extent=None):
+    """Burn the 'field_name' values of an OGR layer into a dataset.
+
+    Features are burned in layer order, so later features overwrite
+        earlier ones, and the count of burned features is returned.
+    If a 'clip_extent' rectangle is given, geometries are clipped to it
+        and burned through an OGR memory layer.
+    """
+    if clip_extent is not None:
+        return burn_records(
+            dataset,
+            ogr_records(ogr_layer, field_name, clip_extent),
+            field_name
+        )
+    err = gdal.RasterizeLayer(
+        dataset,
+        [1],
+        ogr_layer,
+        options=[f'ATTRIBUTE={field_name}']
+    )
+    if err != gdal.CE_None:
+        raise QgsProcessingException(gdal.GetLastErrorMsg())
+    return ogr_layer.GetFeatureCount()
+
+
+def burn_records(dataset, records, field_name):
+    """Burn (WKB, value) records into a dataset, in order.
+
+    Return the count of burned records.
+    """
+    datasource, ogr_layer = records_to_ogr_layer(
+        records,
+        field_name,
+        dataset.GetProjection()
+    )
+    count = burn_ogr_layer(dataset, ogr_layer, field_name)
+    ogr_layer = None
+    datasource = None
+    return count
+
+
+def burn_layer(dataset, layer, field_name, extent=None, clip_extent=None):
+    """Burn the 'field_name' values of a QGIS vector layer into a dataset.
+
+    OGR backed layers are read straight from their datasource; other
+        providers are streamed from QGIS. Geometries of both are clipped
+        to 'clip_extent', if it is given.
+    Only features intersecting 'extent' are read, if it is given.
+    Return the count of burned features.
+    """
+    datasource, ogr_layer = open_ogr_layer(layer, extent)
+    if ogr_layer is None:
+        features = layer.getFeatures(
+            feature_request(layer, field_name, extent)
+        )
+        return burn_records(
+            dataset,
+            feature_records(features, field_name, clip_extent),
+            field_name
+        )
+    count = burn_ogr_layer(dataset, ogr_layer, field_name, clip_extent)
+    ogr_layer = None
+    datasource = None
+    return count
+
+
+def boundary_records(features, clip_extent=None):
+    """Yield (WKB, 1) records of the boundaries of polygon features.
+
+    If a 'clip_extent' rectangle is given, boundaries are clipped to it.
+    """
+    for feat in features:
+        geom = feat.geometry()
+        if geom.isNull() or geom.isEmpty():
+            continue
+        lines = QgsGeometry(geom.constGet().boundary())
+        if clip_extent is not None:
+            lines = lines.clipped(clip_extent)
+        if lines.isNull() or lines.isEmpty():
+            continue
+        yield bytes(lines.asWkb()), 1.0
+
+
+def burn_boundaries(dataset, layer, extent=None, clip_extent=None):
+    """Burn the boundaries of the polygons of a QGIS layer into a dataset.
+
+    Every pixel touched by a boundary is burned with 1, so the burned
+        lines are connected at any angle.
+    Only features intersecting 'extent' are read, if it is given.
+    Return the count of burned features.
+    """
+    request = QgsFeatureRequest().setNoAttributes()
+    if extent is not None:
+        request.setFilterRect(extent)
+    datasource, ogr_layer = records_to_ogr_layer(
+        boundary_records(layer.getFeatures(request), clip_extent),
+        'burn',
+        dataset.GetProjection()
+    )
+    err = gdal.RasterizeLayer(
+        dataset,
+        [1],
+        ogr_layer,
+        burn_values=[1],
+        options=['ALL_TOUCHED=TRUE']
+    )
+    if err != gdal.CE_None:
+        raise QgsProcessingException(gdal.GetLastErrorMsg())
+    count = ogr_layer.GetFeatureCount()
+    ogr_layer = None
+    datasource = None
+    return count
+
+
+def _read_batches(source, request, field_name, clip_extent, batches,
+                  batch_size, stop):
+    """Put batches of (WKB, value) records of a source in a queue.
+
+    A None item is put after the last batch. Reading ends early when the
+        'stop' event is set.
+    """
+    batch = []
+    items = feature_records(
+        source.getFeatures(request),
+        field_name,
+        clip_extent
+    )
+    try:
+        for record in items:
+            batch.append(record)
+            if len(batch) == batch_size:
+                if not _put(batches, batch, stop):
+                    return
+                batch = []
+        if batch and not _put(batches, batch, stop):
+            return
+    finally:
+        _put(batches, None, stop)
+
+
+def _put(batches, item, stop):
+    """Put an item in a bounded queue, giving up when 'stop' is set."""
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def burn_layers(dataset, layers, field_name, extent=None, clip_extent=None,
+                workers=1, batch_size=1000, queue_size=4, feedback=None):
+    """Burn several QGIS vector layers into a dataset, in layer order.
+
+    Layers that OGR can not read directly are read concurrently by up to
+        'workers' threads from feature source snapshots, feeding the burn
+        stage through bounded queues of 'queue_size' batches each, so
+        layers and their features are still burned in order.
+    Only features intersecting 'extent' are read, and geometries are
+        clipped to 'clip_extent', if they are given.
+    Yield a tuple (layer, count, seconds) after each layer is burned.
+    """
+    if workers <= 1:
+        for layer in layers:
+            start_time = time.perf_counter()
+            count = burn_layer(
+                dataset,
+                layer,
+                field_name,
+                extent,
+                clip_extent
+            )
+            yield layer, count, time.perf_counter() - start_time
+            if feedback is not None and feedback.isCanceled():
+                return
+        return
+
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        readers = []
+        for layer in layers:
+            datasource, ogr_layer = open_ogr_layer(layer, extent)
+            if ogr_layer is not None:
+                readers.append((datasource, ogr_layer, None, None))
+                continue
+            # Feature sources must be created in the thread of the layer.
+            source = QgsVectorLayerFeatureSource(layer)
+            batches = queue.Queue(maxsize=queue_size)
+            future = executor.submit(
+                _read_batches,
+                source,
+                feature_request(layer, field_name, extent),
+                field_name,
+                clip_extent,
+                batches,
+                batch_size,
+                stop
+            )
+            readers.append((None, None, batches, future))
+
+        try:
+            for layer, reader in zip(layers, readers):
+                datasource, ogr_layer, batches, future = reader
+                start_time = time.perf_counter()
+                count = 0
+                if ogr_layer is not None:
+                    count = burn_ogr_layer(
+                        dataset,
+                        ogr_layer,
+                        field_name,
+                        clip_extent
+                    )
+                else:
+                    for batch in iter(batches.get, None):
+                        count += burn_records(dataset, batch, field_name)
+                        if feedback is not None and feedback.isCanceled():
+                            return
+                    future.result()
+                ogr_layer = None
+                datasource = None
+                yield layer, count, time.perf_counter() - start_time
+                if feedback is not None and feedback.isCanceled():
+                    return
+        finally:
+            stop.set()
+
+
+def create_output(path, driver_name, x_size, y_size, crs_wkt, geotransform,
+                  output_type=0, height_factor=1):
+    """Create the single band output dataset of a rasterized map.
+
+    'output_type' is an index of OUTPUT_TYPES. Integer types store fixed
+        point heights, multiplied by 'height_factor', and the band scale
+        is set to its inverse so readers get the heights back.
+    GeoTIFF outputs are tiled and use the predictor of the data type.
+    """
+    _name, gdal_type, np_type, predictor = OUTPUT_TYPES[output_type]
+    options = ['COMPRESS=LZW']
+    if driver_name == 'GTiff':
+        options += ['TILED=YES', f'PREDICTOR={predictor}']
+        if y_size * x_size * np.dtype(np_type).itemsize >= 2**32:
+            options.append('BIGTIFF=YES')
+    dataset = gdal.GetDriverByName(driver_name).Create(
+        path,
+        x_size,
+        y_size,
+        1,
+        gdal_type,
+        options=options
+    )
+    dataset.SetProjection(crs_wkt)
+    dataset.SetGeoTransform(geotransform)
+    if np.issubdtype(np_type, np.integer):
+        band = dataset.GetRasterBand(1)
+        band.SetScale(1.0 / height_factor)
+        band.SetOffset(0.0)
+        band.SetMetadataItem('HEIGHT_FACTOR', str(height_factor))
+    return dataset
+
+
+def quantize(block, output_type=0, height_factor=1):
+    """Convert a block of heights to the data type of an output type.
+
+    Integer types get the heights multiplied by 'height_factor', rounded
+        and clipped to the range of the type.
+    """
+    np_type = OUTPUT_TYPES[output_type][2]
+    if not np.issubdtype(np_type, np.integer):
+        return block.astype(np_type)
+    info = np.iinfo(np_type)
+    fixed = np.rint(block * height_factor)
+    return np.clip(fixed, info.min, info.max).astype(np_type)
+
+
+def clipped_cells(block, output_type=0, height_factor=1):
+    """Return the count of heights of a block that quantize would clip.
+
+    Heights multiplied by 'height_factor' that fall outside the range of
+        an integer output type are clipped; floating point types never
+        clip.
+    """
+    np_type = OUTPUT_TYPES[output_type][2]
+    if not np.issubdtype(np_type, np.integer):
+        return 0
+    info = np.iinfo(np_type)
+    fixed = np.rint(block * height_factor)
+    return int(np.count_nonzero((fixed < info.min) | (fixed > info.max)))
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Compute map scales and scale geometries to the map size.
+
+************************************************************************
+    Name                : scale.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+from math import ceil
+
+from qgis.core import (
+    QgsGeometry,
+    QgsRectangle,
+    QgsUnitTypes
+)
+from qgis.PyQt.QtGui import QTransform
+
+from tactilemaps.utils import wkb
+
+# Features scaled together by scale_features.
+BATCH_SIZE = 1000
+
+
+def units_factor(crs):
+    """Return the length in 'crs' units of a tenth of milimeter on paper.
+
+    The length is for a scale denominator of 1.
+    """
+    return QgsUnitTypes.fromUnitToUnitFactor(
+        QgsUnitTypes.DistanceMeters,
+        crs.mapUnits()
+    ) / 10000.0
+
+
+def compute_scale(extent, crs, width, height, margin=0, multiple=1):
+    """Compute the scale denominator to fit an extent in a map.
+
+    'width' and 'height' are the size of the map, in tenths of milimeter.
+    The extent is expanded by a 'margin' percentage, and the denominator
+        is rounded up to a 'multiple'.
+    Return a tuple of the scale denominator and the rectangle that the map
+        covers at that scale, centered on the extent.
+    """
+    factor = units_factor(crs)
+    map_width = width * factor
+    map_height = height * factor
+    extent = QgsRectangle(extent)
+    extent.scale(1 + margin / 100)
+    scale = max(
+        extent.width() / map_width,
+        extent.height() / map_height
+    )
+    rounded_scale = multiple * ceil(scale / multiple)
+    rectangle = QgsRectangle.fromCenterAndSize(
+        extent.center(),
+        map_width * rounded_scale,
+        map_height * rounded_scale
+    )
+    return rounded_scale, rectangle
+
+
+def scale_transform(center, scale_number):
+    """Return the transform from map coordinates to the scaled map.
+
+    Geometries are scaled by the scale denominator, from meters to tenths
+        of milimeter, and translated so 'center' goes to the origin.
+    """
+    scale_factor = 10000 / scale_number
+    return QTransform(
+        scale_factor,
+        0.0,
+        0.0,
+        scale_factor,
+        -center.x() * scale_factor,
+        -center.y() * scale_factor
+    )
+
+
+def scale_features(features, transformer):
+    """Scale the geometries of a list of features in place.
+
+    The WKB of all the geometries is transformed with a single NumPy
+        operation, falling back to transform each geometry if any of them
+        is not supported by the WKB reader.
+    Return the list of features.
+    """
+    wkbs = [
+        bytes(feat.geometry().asWkb()) if feat.hasGeometry() else None
+        for feat in features
+    ]
+    try:
+        scaled = wkb.affine(
+            wkbs,
+            transformer.m11(),
+            transformer.m12(),
+            transformer.m21(),
+            transformer.m22(),
+            transformer.dx(),
+            transformer.dy()
+        )
+    except ValueError:
+        for feat in features:
+            geom = feat.geometry()
+            geom.transform(transformer)
+            feat.setGeometry(geom)
+        return features
+    for feat, data in zip(features, scaled):
+        if data is not None:
+            geom = QgsGeometry()
+            geom.fromWkb(data)
+            feat.setGeometry(geom)
+    return features
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Separable smoothing of height arrays.
+
+************************************************************************
+    Name                : smoothing.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+from functools import lru_cache
+from math import ceil
+
+import numpy as np
+
+# Available convolution methods, in the order shown by the algorithms.
+METHODS = ('auto', 'direct', 'fft')
+
+# Available kernel families, in the order shown by the algorithms.
+KERNELS = ('gaussian', 'box', 'cone')
+
+# Automatic kernel radii are truncated at this many sigmas.
+TRUNCATE = 3
+
+# Kernel length from which the 'auto' method switches to FFT.
+FFT_THRESHOLD = 64
+
+
+def gaussian_kernel(radius, sigma):
+    """Return a normalized 1-D Gaussian kernel of 2*radius+1 taps."""
+    dist = np.linspace(-radius, radius, radius*2+1)
+    kernel = np.exp(-dist**2 / (2*sigma**2))
+    return kernel / kernel.sum()
+
+
+@lru_cache(maxsize=16)
+def build_kernel(family, radius, sigma, pixel_size):
+    """Return a normalized, read-only, 1-D smoothing kernel.
+
+    'radius' and 'sigma' are in map units and are converted to pixels
+        with 'pixel_size'. The kernel has 2*radius+1 taps, as the fixed
+        kernel of the first releases, but a 'radius' of zero is automatic:
+        TRUNCATE sigmas, beyond which Gaussian weights are negligible, so a
+        large sigma does not add needless taps.
+    The 'box' kernel has equal weights and the 'cone' kernel weights
+        decrease linearly from the center, rounding dots as domes.
+    Kernels are cached by their arguments, pixel size included.
+    """
+    if family not in KERNELS:
+        raise ValueError(
+            f"Invalid kernel. Expected one of {', '.join(KERNELS)}."
+        )
+    sigma_px = sigma / pixel_size
+    if radius > 0:
+        radius_px = int(round(radius / pixel_size))
+    else:
+        radius_px = ceil(TRUNCATE * sigma_px)
+    if family == 'gaussian':
+        kernel = gaussian_kernel(radius_px, sigma_px)
+    elif family == 'box':
+        kernel = np.full(radius_px*2+1, 1.0 / (radius_px*2+1))
+    else:
+        dist = np.abs(np.linspace(-radius_px, radius_px, radius_px*2+1))
+        kernel = radius_px + 1 - dist
+        kernel = kernel / kernel.sum()
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _convolve_direct(arr, kernel, axis):
+    """Convolve along an axis adding one shifted slice per kernel tap."""
+    n = arr.shape[axis]
+    size = kernel.size
+    half = (size - 1) // 2
+    pad = [(0, 0)] * arr.ndim
+    pad[axis] = (size - 1 - half, half)
+    padded = np.pad(np.asarray(arr, dtype=np.float64), pad)
+    out = np.zeros(padded.shape[:axis] + (n,) + padded.shape[axis+1:])
+    window = [slice(None)] * arr.ndim
+    for j, weight in enumerate(kernel[::-1]):
+        window[axis] = slice(j, j + n)
+        out += weight * padded[tuple(window)]
+    return out
+
+
+def _convolve_fft(arr, kernel, axis):
+    """Convolve along an axis through the real FFT."""
+    n = arr.shape[axis]
+    size = kernel.size
+    half = (size - 1) // 2
+    n_fft = n + size - 1
+    spectrum = np.fft.rfft(
+        np.asarray(arr, dtype=np.float64), n_fft, axis=axis
+    )
+    shape = [1] * arr.ndim
+    shape[axis] = -1
+    spectrum *= np.fft.rfft(kernel, n_fft).reshape(shape)
+    full = np.fft.irfft(spectrum, n_fft, axis=axis)
+    return np.take(full, np.arange(half, half + n), axis=axis)
+
+
+def convolve_axis(arr, kernel, axis, method='auto'):
+    """Convolve every line of 'arr' along 'axis' with a 1-D kernel.
+
+    The output has the shape of 'arr' and the same values as
+        np.convolve(line, kernel, mode='same') applied to each line, as
+        values outside the array are taken as zeros.
+    The 'direct' method adds one shifted copy of the array per kernel tap.
+    The 'fft' method multiplies spectra, and is faster for long kernels.
+    The 'auto' method chooses between them by the kernel length.
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f"Invalid method. Expected one of {', '.join(METHODS)}."
+        )
+    kernel = np.asarray(kernel, dtype=np.float64)
+    if method == 'auto':
+        method = 'fft' if kernel.size >= FFT_THRESHOLD else 'direct'
+    if method == 'fft':
+        return _convolve_fft(arr, kernel, axis)
+    return _convolve_direct(arr, kernel, axis)
+
+
+def smooth(arr, kernel, method='auto'):
+    """Smooth a 2-D array with a separable kernel.
+
+    Columns are convolved first and rows after, with zeros outside the
+        array, so the result has the shape of the input.
+    """
+    cols = convolve_axis(arr, kernel, 0, method)
+    return convolve_axis(cols, kernel, 1, method)
+
+
+def iter_smoothed_blocks(read_rows, n_rows, kernel, block_rows=0,
+                         method='auto'):
+    """Smooth a 2-D array by blocks of rows, yielding the smoothed blocks.
+
+    'read_rows' is a callable that returns 'count' rows of the source
+        array starting at row 'offset', as read_rows(offset, count).
+    Each block is read with a halo of the kernel radius above and below,
+        so the yielded blocks, stacked, are equal to smooth(arr, kernel).
+    A 'block_rows' of zero (or more than 'n_rows') smooths everything
+        as a single block.
+    Yield tuples (offset, block), where 'offset' is the first row of the
+        block in the source array.
+    """
+    kernel = np.asarray(kernel, dtype=np.float64)
+    after = (kernel.size - 1) // 2
+    before = kernel.size - 1 - after
+    if block_rows <= 0:
+        block_rows = n_rows
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        top = max(start - before, 0)
+        bottom = min(stop + after, n_rows)
+        window = read_rows(top, bottom - top)
+        cols = convolve_axis(window, kernel, 0, method)
+        cols = cols[start - top:stop - top]
+        yield start, convolve_axis(cols, kernel, 1, method)
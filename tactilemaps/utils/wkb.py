@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""Transform the coordinates of WKB geometries in bulk.
+
+************************************************************************
+    Name                : wkb.py
+    Date                : October 2026
+    Copyright           : (C) 2023-2026 by Laboratorio de Geociencias - FIE
+    Email               : geociencias@fie.undef.edu.ar
+************************************************************************
+  This program is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+************************************************************************
+"""
+
+import struct
+
+import numpy as np
+
+# Base WKB types by layout of their content.
+POINT_TYPES = {1}
+CURVE_TYPES = {2, 8}
+POLYGON_TYPES = {3, 17}
+COLLECTION_TYPES = {4, 5, 6, 7, 9, 10, 11, 12, 15, 16}
+
+# EWKB flags of the geometry type.
+EWKB_Z = 0x80000000
+EWKB_M = 0x40000000
+EWKB_SRID = 0x20000000
+
+UINT32 = struct.Struct('<I')
+
+
+def read_header(buffer, offset):
+    """Read the header of the WKB geometry at 'offset' of a buffer.
+
+    Only little endian WKB is read, as written by QGIS and GDAL on every
+        supported platform.
+    Return a tuple of the offset after the header, the base geometry
+        type and the count of doubles per point.
+    """
+    if buffer[offset] != 1:
+        raise ValueError('Big endian WKB is not supported.')
+    (wkb_type,) = UINT32.unpack_from(buffer, offset + 1)
+    offset += 5
+    dims = 2
+    if wkb_type & (EWKB_Z | EWKB_M | EWKB_SRID):
+        dims += bool(wkb_type & EWKB_Z) + bool(wkb_type & EWKB_M)
+        if wkb_type & EWKB_SRID:
+            offset += 4
+        wkb_type &= 0x0FFFFFFF
+    dims += (0, 1, 1, 2)[wkb_type // 1000]
+    return offset, wkb_type % 1000, dims
+
+
+def coordinate_runs(buffer, offset=0, runs=None):
+    """Find the coordinates of the WKB geometry at 'offset' of a buffer.
+
+    Append to 'runs' a (offset, count, dims) tuple for each sequence of
+        'count' points of 'dims' doubles.
+    Return a tuple of the offset after the geometry and the runs.
+    """
+    if runs is None:
+        runs = []
+    offset, wkb_type, dims = read_header(buffer, offset)
+    if wkb_type in POINT_TYPES:
+        runs.append((offset, 1, dims))
+        return offset + 8 * dims, runs
+    (count,) = UINT32.unpack_from(buffer, offset)
+    offset += 4
+    if wkb_type in CURVE_TYPES:
+        runs.append((offset, count, dims))
+        return offset + 8 * dims * count, runs
+    if wkb_type in POLYGON_TYPES:
+        for _ in range(count):
+            (points,) = UINT32.unpack_from(buffer, offset)
+            runs.append((offset + 4, points, dims))
+            offset += 4 + 8 * dims * points
+        return offset, runs
+    if wkb_type in COLLECTION_TYPES:
+        for _ in range(count):
+            offset, runs = coordinate_runs(buffer, offset, runs)
+        return offset, runs
+    raise ValueError(f'Unsupported WKB geometry type {wkb_type}.')
+
+
+def xy_offsets(runs):
+    """Return the byte offsets of the X coordinates of all the run points."""
+    if not runs:
+        return np.empty(0, dtype=np.int64)
+    starts, counts, dims = np.array(runs, dtype=np.int64).T
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    point = np.arange(counts.sum()) - first
+    return np.repeat(starts, counts) + point * np.repeat(dims * 8, counts)
+
+
+def affine(wkbs, m11, m12, m21, m22, dx, dy):
+    """Apply an affine transform to the XY coordinates of WKB geometries.
+
+    The transform follows QTransform: x' = m11 * x + m21 * y + dx and
+        y' = m12 * x + m22 * y + dy. Z and M values are kept.
+    All the geometries are joined in a single buffer, which is modified in
+        place with a single NumPy operation for all their coordinates.
+    Return the list of transformed WKB, with None for None items.
+    """
+    buffer = bytearray()
+    bounds = []
+    runs = []
+    for wkb in wkbs:
+        if wkb is None:
+            bounds.append(None)
+            continue
+        start = len(buffer)
+        buffer += wkb
+        end, runs = coordinate_runs(buffer, start, runs)
+        bounds.append((start, end))
+
+    view = np.frombuffer(buffer, dtype=np.uint8)
+    x_bytes = xy_offsets(runs)[:, None] + np.arange(8)
+    y_bytes = x_bytes + 8
+    x = view[x_bytes].copy().view('<f8')[:, 0]
+    y = view[y_bytes].copy().view('<f8')[:, 0]
+    new_x = m11 * x + m21 * y + dx
+    new_y = m12 * x + m22 * y + dy
+    view[x_bytes] = new_x.astype('<f8')[:, None].view(np.uint8)
+    view[y_bytes] = new_y.astype('<f8')[:, None].view(np.uint8)
+
+    return [
+        None if bound is None else bytes(buffer[bound[0]:bound[1]])
+        for bound in bounds
+    ]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Fixtures of the Tactile Maps tests.
+
+Tests are run from the root of the repository with the Python of a QGIS
+installation:
+
+    python3 -m pytest tests
+
+Tests needing QGIS are skipped where it is not installed.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def qgis_app():
+    """Return the QGIS application, initialized once without its GUI."""
+    pytest.importorskip('qgis.core')
+    from scripts.headless import qgis_application
+    with qgis_application() as app:
+        yield app
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Tests of tactilemaps.utils.braille."""
+
+import pytest
+
+pytest.importorskip('qgis')
+
+from qgis.core import QgsGeometry  # noqa: E402
+
+from tactilemaps.utils import braille  # noqa: E402
+
+# Maximum area of the symmetric difference of both engines, in squared
+# tenths of milimeter.
+TOLERANCE = 1e-6
+
+
+@pytest.mark.parametrize('text', [
+    'a',
+    'Hola mundo',
+    'Río de la Plata\nBuenos Aires 1810',
+    '¿Qué? ¡Sí! "Ñandú", 42.',
+    'abcdefghijklmnñopqrstuvwxyz áéíóúü 0123456789',
+])
+def test_stamp_dots_matches_buffer(qgis_app, text):
+    """Stamped dots match the buffer of the dot points of Write Braille."""
+    multipoint, _errors = braille.translate(text)
+    buffered = QgsGeometry(multipoint).buffer(braille.DIM['e'] / 2, 5)
+    coords, _errors = braille.layout(text)
+    stamped = braille.stamp_dots(coords)
+    assert stamped.constGet().numGeometries() == len(coords)
+    assert buffered.constGet().numGeometries() == len(coords)
+    assert buffered.symDifference(stamped).area() <= TOLERANCE
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Tests of the Rasterize edges algorithm."""
+
+import pytest
+
+pytest.importorskip('qgis')
+gdal = pytest.importorskip('osgeo.gdal')
+
+from qgis.core import (  # noqa: E402
+    QgsFeature,
+    QgsGeometry,
+    QgsProcessingContext,
+    QgsProcessingFeedback,
+    QgsVectorLayer
+)
+
+from tactilemaps.processing.algorithms import (  # noqa: E402
+    rasterizeedges_algorithm
+)
+
+
+def test_edge_just_outside_the_extent(qgis_app, tmp_path):
+    """A boundary outside the map, within half the width, gets its band."""
+    layer = QgsVectorLayer('Polygon?crs=EPSG:3857', 'polygons', 'memory')
+    feat = QgsFeature()
+    feat.setGeometry(QgsGeometry.fromWkt(
+        'POLYGON((-3 -50, 200 -50, 200 150, -3 150, -3 -50))'
+    ))
+    layer.dataProvider().addFeatures([feat])
+    output = str(tmp_path / 'edges.tif')
+
+    alg = rasterizeedges_algorithm.RasterizeEdges()
+    alg.initAlgorithm()
+    results, ok = alg.run(
+        {
+            'INPUT_LAYERS': [layer],
+            'WIDTH': 12,
+            'EXTENT': '0,100,0,100 [EPSG:3857]',
+            'PIXEL_SIZE': 1,
+            'OUTPUT_RASTER': output
+        },
+        QgsProcessingContext(),
+        QgsProcessingFeedback()
+    )
+    assert ok
+    heights = gdal.Open(results['OUTPUT_RASTER']).ReadAsArray()
+
+    # The boundary at x = -3 is 3.5 pixels from the first column and the
+    # band is 6 pixels wide on each side of it.
+    assert heights.shape == (100, 100)
+    assert (heights[:, :2] > 0).all()
+    assert (heights[:, 10:] == 0).all()